@@ -8,14 +8,18 @@ programmatically without the GUI interface.
 
 import sys
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 
 # Add the src directory to the path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from ocr_scanner.core.batch_processor import BatchProcessor
 from ocr_scanner.utils.export import ResultExporter
+from ocr_scanner.utils.image_utils import ImageUtils
 
 
 class SimpleBatchProcessor:
@@ -26,7 +30,8 @@ class SimpleBatchProcessor:
     
     def process_images(self, image_paths: List[str], 
                       preprocessing_method: str = "None",
-                      threshold_value: int = 127) -> List[Dict[str, Any]]:
+                      threshold_value: int = 127,
+                      max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Process multiple images and return results.
         
@@ -34,31 +39,50 @@ class SimpleBatchProcessor:
             image_paths: List of image file paths
             preprocessing_method: Preprocessing method to apply
             threshold_value: Threshold value for binary threshold
+            max_workers: Number of worker threads (defaults to CPU count)
             
         Returns:
             List of processing results
         """
-        results = []
+        return list(self.iter_images(image_paths, preprocessing_method,
+                                     threshold_value, max_workers))
+    
+    def iter_images(self, image_paths: List[str], 
+                    preprocessing_method: str = "None",
+                    threshold_value: int = 127,
+                    max_workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Process multiple images, yielding each result in input order.
         
-        for i, image_path in enumerate(image_paths):
+        Lets exporters write rows as they arrive instead of waiting for the
+        whole batch to be collected in memory. At most two images per
+        worker are in flight, so finished results don't pile up behind a
+        slow one.
+        
+        Args:
+            image_paths: List of image file paths
+            preprocessing_method: Preprocessing method to apply
+            threshold_value: Threshold value for binary threshold
+            max_workers: Number of worker threads (defaults to CPU count)
+            
+        Yields:
+            Processing result for each image
+        """
+        # One processor is enough: preprocessing and OCR only read its settings
+        processor = BatchProcessor(image_paths, preprocessing_method, threshold_value)
+        total = len(image_paths)
+        
+        def process_one(image_path: str) -> Dict[str, Any]:
+            filename = os.path.basename(image_path)
             try:
-                filename = os.path.basename(image_path)
-                print(f"Processing {i+1}/{len(image_paths)}: {filename}")
-                
-                # Create a simple processor for this image
-                processor = BatchProcessor([image_path], preprocessing_method, threshold_value)
-                
-                # Process the image (simplified version)
-                import cv2
-                image = cv2.imread(image_path)
+                image = ImageUtils.load_image(image_path)
                 if image is None:
-                    results.append({
+                    return {
                         'filename': filename,
                         'text': '',
                         'status': 'Error: Could not load image',
                         'timestamp': ''
-                    })
-                    continue
+                    }
                 
                 # Apply preprocessing
                 processed_image = processor._apply_preprocessing(image)
@@ -66,22 +90,37 @@ class SimpleBatchProcessor:
                 # Run OCR
                 text, status = processor._run_ocr(processed_image)
                 
-                results.append({
+                return {
                     'filename': filename,
                     'text': text,
                     'status': status,
                     'timestamp': ''
-                })
+                }
                 
             except Exception as e:
-                results.append({
-                    'filename': os.path.basename(image_path),
+                return {
+                    'filename': filename,
                     'text': '',
                     'status': f'Error: {str(e)}',
                     'timestamp': ''
-                })
+                }
         
-        return results
+        # Tesseract and OpenCV release the GIL, so threads overlap the heavy work
+        workers = max_workers or os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            paths = iter(image_paths)
+            pending = deque(executor.submit(process_one, path)
+                            for path in islice(paths, 2 * workers))
+            done = 0
+            while pending:
+                result = pending.popleft().result()
+                # Refill the window as each result is handed on
+                path = next(paths, None)
+                if path is not None:
+                    pending.append(executor.submit(process_one, path))
+                done += 1
+                print(f"Processed {done}/{total}: {result['filename']}")
+                yield result
 
 
 def main():
@@ -109,22 +148,31 @@ def main():
     print(f"Processing {len(valid_paths)} images...")
     
     try:
-        # Process images
+        # Process images, streaming each result straight to the exporter
         processor = SimpleBatchProcessor()
-        results = processor.process_images(valid_paths, "Grayscale")
+        counts = {'total': 0, 'successful': 0}
+        
+        def tally(results: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+            for result in results:
+                counts['total'] += 1
+                if result['status'] == 'Success':
+                    counts['successful'] += 1
+                yield result
+        
+        results = tally(processor.iter_images(valid_paths, "Grayscale"))
         
-        # Export results
+        # Export results; every path yields exactly one result, so the
+        # exporters get the count up front and never hold the whole batch
         if output_file.endswith('.csv'):
             ResultExporter.export_to_csv(results, output_file)
         elif output_file.endswith('.json'):
-            ResultExporter.export_to_json(results, output_file)
+            ResultExporter.export_to_json(results, output_file, total=len(valid_paths))
         else:
-            ResultExporter.export_to_txt(results, output_file)
+            ResultExporter.export_to_txt(results, output_file, total=len(valid_paths))
         
         # Print summary
-        successful = len([r for r in results if r['status'] == 'Success'])
         print(f"\nProcessing completed!")
-        print(f"Successfully processed: {successful}/{len(results)} images")
+        print(f"Successfully processed: {counts['successful']}/{counts['total']} images")
         print(f"Results saved to: {output_file}")
         
     except Exception as e:
@@ -19,13 +19,25 @@ SUPPORTED_IMAGE_FORMATS = [
 
 IMAGE_FILTER = "Image Files (" + " ".join(SUPPORTED_IMAGE_FORMATS) + ")"
 
+# Images whose long side exceeds MAX_LOAD_SIDE are decoded at a reduced
+# resolution, but never below MIN_REDUCED_SIDE (Tesseract needs the detail)
+MAX_LOAD_SIDE = 4000
+MIN_REDUCED_SIDE = 2000
+
 # OCR settings
 DEFAULT_OCR_CONFIG = {
     "confidence_threshold": 60,
     "language": "eng",
     "page_segmentation_mode": 6,  # PSM_SINGLE_UNIFORM_BLOCK
+    # Larger images are downscaled before OCR; accuracy saturates around
+    # 300 DPI while layout analysis keeps getting slower
+    "max_ocr_dim": 2400,
 }
 
+# Files per Tesseract invocation in batch mode (start-up and language data
+# loading are paid once per chunk)
+BATCH_OCR_CHUNK_SIZE = 16
+
 # Supported OCR languages
 SUPPORTED_LANGUAGES = {
     "eng": "English",
@@ -65,6 +77,9 @@ SUPPORTED_LANGUAGES = {
     "est": "Estonian"
 }
 
+# Language selector entries as (label, code), formatted once for every combo box
+LANGUAGE_ITEMS = [(f"{name} ({code})", code) for code, name in SUPPORTED_LANGUAGES.items()]
+
 # GUI settings
 DEFAULT_WINDOW_SIZE = (1400, 900)
 DEFAULT_IMAGE_DISPLAY_SIZE = (640, 480)
@@ -76,6 +91,7 @@ PREPROCESSING_OPTIONS = [
     "Threshold",
     "Adaptive Threshold",
     "Denoise",
+    "Bilateral Filter",
     "Auto Rotate",
     "Deskew",
     "Perspective Correction"
@@ -111,6 +127,10 @@ def get_config_dir() -> Path:
     config_dir.mkdir(parents=True, exist_ok=True)
     return config_dir
 
+def get_ocr_cache_path() -> Path:
+    """Get the batch OCR result cache database path."""
+    return get_app_data_dir() / 'ocr_cache.db'
+
 def get_log_dir() -> Path:
     """Get log directory."""
     log_dir = get_app_data_dir() / 'logs'
@@ -4,35 +4,295 @@ Batch processing functionality for OCR Scanner.
 
 import os
 import logging
-from typing import List, Optional, Tuple
+import queue
+import tempfile
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import cv2
 import numpy as np
 import pytesseract
 from PyQt5.QtCore import QThread, pyqtSignal
 from PIL import Image
 
-from ..config.settings import DEFAULT_OCR_CONFIG
+from ..config.settings import DEFAULT_OCR_CONFIG, BATCH_OCR_CHUNK_SIZE
+from .image_processor import ImageProcessor, ocr_page_files
+from .ocr_cache import OCRCache
+from .preprocessing_ops import GRAY_METHODS, POINTWISE_METHODS, to_gray
+
+try:
+    from tesserocr import PyTessBaseAPI
+except ImportError:  # optional in-process engine, pytesseract is the fallback
+    PyTessBaseAPI = None
 
 logger = logging.getLogger(__name__)
 
+# Resident Tesseract engines of this worker process, keyed by language;
+# None where the engine failed to initialize
+_tess_apis: Dict[str, Optional["PyTessBaseAPI"]] = {}
+
+# Decoded images a worker's loader thread may run ahead of its OCR loop
+_LOAD_QUEUE_SIZE = 4
+
+
+def _init_worker(cv_threads: int) -> None:
+    """
+    Configure threading in a pool worker.
+    
+    Tesseract gets one OpenMP thread; the pool supplies the parallelism.
+    OpenCV's parallel_for (the Denoise filter in particular) gets the
+    worker's share of the cores, so small batches still use every core
+    and large ones don't oversubscribe. OpenCL offload is left to the
+    single-image path.
+    """
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+    cv2.setUseOptimized(True)
+    cv2.setNumThreads(cv_threads)
+    # Every worker would open its own OpenCL context on the one GPU
+    cv2.ocl.setUseOpenCL(False)
+
+
+def _get_tess_api(language: str) -> Optional["PyTessBaseAPI"]:
+    """
+    Get this process's resident Tesseract engine for a language.
+    
+    The language data is loaded once per worker instead of once per
+    file. Returns None when tesserocr is not installed or the engine
+    can't be initialized, in which case the pytesseract CLI is used. A
+    failed initialization is remembered, so each worker tries (and logs)
+    it only once.
+    """
+    if PyTessBaseAPI is None:
+        return None
+    if language not in _tess_apis:
+        try:
+            _tess_apis[language] = PyTessBaseAPI(
+                lang=language, psm=DEFAULT_OCR_CONFIG["page_segmentation_mode"])
+        except Exception as e:
+            logger.warning(f"tesserocr unavailable for '{language}', using pytesseract: {e}")
+            _tess_apis[language] = None
+    return _tess_apis[language]
+
+
+def _preprocess(img: np.ndarray, method: str, threshold_value: int,
+                dst: Optional[np.ndarray] = None) -> np.ndarray:
+    """Apply the named preprocessing method to an image (see ImageProcessor.apply_preprocessing)."""
+    return ImageProcessor.apply_preprocessing(img, method, threshold_value, dst)
+
+
+def _crop_roi(img: np.ndarray, roi_rect: Optional[Tuple[int, int, int, int]]) -> np.ndarray:
+    """Crop an image to the ROI, clamped to the image bounds."""
+    if not roi_rect:
+        return img
+        
+    x1, y1, x2, y2 = roi_rect
+    h, w = img.shape[:2]
+    
+    # Ensure ROI is within image bounds
+    x1, y1 = max(0, x1), max(0, y1)
+    x2, y2 = min(w, x2), min(h, y2)
+    
+    if x2 > x1 and y2 > y1:
+        return img[y1:y2, x1:x2]
+    else:
+        logger.warning("Invalid ROI coordinates, using full image")
+        return img
+
+
+def _ocr(img: np.ndarray, language: str) -> Tuple[str, str]:
+    """Run OCR on a processed image and return (text, status)."""
+    try:
+        # Tesseract binarizes a luminance image anyway, so hand it gray rather
+        # than paying for a full BGR->RGB swap
+        pil_image = Image.fromarray(to_gray(img))
+        
+        # Run OCR with configuration
+        text = pytesseract.image_to_string(pil_image, lang=language, config=_ocr_config()).strip()
+        
+        status = "Success" if text else "No text detected"
+        return text, status
+        
+    except Exception as e:
+        logger.error(f"OCR failed: {e}")
+        return "", f"OCR Error: {str(e)}"
+
+
+def _ocr_config() -> str:
+    return f'--oem 3 --psm {DEFAULT_OCR_CONFIG["page_segmentation_mode"]}'
+
+
+def _ocr_file(page_path: str, language: str) -> Tuple[str, str]:
+    """Run OCR on one saved page and return (text, status)."""
+    try:
+        text = pytesseract.image_to_string(page_path, lang=language, config=_ocr_config()).strip()
+        status = "Success" if text else "No text detected"
+        return text, status
+    except Exception as e:
+        logger.error(f"OCR failed: {e}")
+        return "", f"OCR Error: {str(e)}"
+
+
+def _load_images(file_paths: List[str], read_flag: int) -> Iterator[Optional[np.ndarray]]:
+    """
+    Decode images on a background thread, one per input path in order.
+    
+    cv2.imread releases the GIL, so reading and decoding the next files
+    overlaps preprocessing and OCR of the current one. The bounded queue
+    caps how many decoded images are held at once. Yields None for files
+    that can't be loaded.
+    """
+    if len(file_paths) < 2:
+        for file_path in file_paths:
+            yield cv2.imread(file_path, read_flag)
+        return
+    
+    loaded: queue.Queue = queue.Queue(maxsize=_LOAD_QUEUE_SIZE)
+    
+    def load() -> None:
+        for file_path in file_paths:
+            try:
+                image = cv2.imread(file_path, read_flag)
+            except Exception as e:
+                logger.warning(f"Failed to read {file_path}: {e}")
+                image = None
+            loaded.put(image)
+    
+    threading.Thread(target=load, name="ocr-loader", daemon=True).start()
+    for _ in file_paths:
+        yield loaded.get()
+
+
+def _process_chunk(file_paths: List[str], preprocessing_method: str, threshold_value: int,
+                   roi_rect: Optional[Tuple[int, int, int, int]],
+                   language: str) -> List[Tuple[str, str, str]]:
+    """
+    Load, preprocess and OCR a group of files.
+    
+    Runs inside a worker process, so it only takes picklable arguments.
+    Files are decoded ahead on a loader thread while the worker OCRs.
+    With tesserocr each image goes to the worker's resident engine.
+    Otherwise the processed images go to the Tesseract CLI in one call,
+    which pays the process start and language data load once per chunk
+    instead of once per file.
+    
+    Returns:
+        One (filename, text, status) tuple per input file, in input order
+    """
+    results: List[Optional[Tuple[str, str, str]]] = [None] * len(file_paths)
+    read_flag = (cv2.IMREAD_GRAYSCALE if preprocessing_method in GRAY_METHODS
+                 else cv2.IMREAD_COLOR)
+    # Point-wise methods only need to touch the ROI, so they run on a view
+    # of it; the others see the whole page and are cropped afterwards
+    crop_first = preprocessing_method in POINTWISE_METHODS
+    
+    # Preprocessing output, reused across same-sized images since each page
+    # is written out before the next file is loaded
+    out_buf = None
+    api = _get_tess_api(language)
+    
+    with tempfile.TemporaryDirectory(prefix="ocr_batch_") as tmp_dir:
+        pages = []  # (index, filename, page_path)
+        images = _load_images(file_paths, read_flag)
+        for index, (file_path, image) in enumerate(zip(file_paths, images)):
+            filename = os.path.basename(file_path)
+            try:
+                logger.debug(f"Processing file: {filename}")
+                
+                if image is None:
+                    error_msg = "Could not load image"
+                    logger.warning(f"Failed to load {filename}: {error_msg}")
+                    results[index] = (filename, "", f"Error: {error_msg}")
+                    continue
+                
+                # Apply ROI and preprocessing
+                if crop_first:
+                    image = _crop_roi(image, roi_rect)
+                if out_buf is None or out_buf.shape != image.shape[:2]:
+                    out_buf = None
+                processed_image = _preprocess(image, preprocessing_method, threshold_value,
+                                              dst=out_buf)
+                if processed_image.ndim == 2 and processed_image is not image:
+                    out_buf = processed_image
+                if not crop_first:
+                    processed_image = _crop_roi(processed_image, roi_rect)
+                
+                if api is not None:
+                    # Raw pixel bytes straight from the array, no PIL image in between
+                    gray = to_gray(processed_image)
+                    height, width = gray.shape
+                    api.SetImageBytes(gray.tobytes(), width, height, 1, width)
+                    text = api.GetUTF8Text().strip()
+                    status = "Success" if text else "No text detected"
+                    logger.debug(f"Processed {filename}: {status}")
+                    results[index] = (filename, text, status)
+                    continue
+                
+                page_path = os.path.join(tmp_dir, f"page_{index}.png")
+                cv2.imwrite(page_path, to_gray(processed_image))
+                pages.append((index, filename, page_path))
+                
+            except Exception as e:
+                error_msg = f"Error: {str(e)}"
+                logger.error(f"Failed to process {filename}: {error_msg}")
+                results[index] = (filename, "", error_msg)
+        
+        texts = None
+        if pages:
+            try:
+                texts = ocr_page_files([page_path for _, _, page_path in pages],
+                                    os.path.join(tmp_dir, "pages.txt"), language)
+            except Exception as e:
+                logger.warning(f"Chunked OCR failed, retrying per file: {e}")
+        
+        for n, (index, filename, page_path) in enumerate(pages):
+            if texts is not None:
+                text = texts[n]
+                status = "Success" if text else "No text detected"
+            else:
+                text, status = _ocr_file(page_path, language)
+            logger.debug(f"Processed {filename}: {status}")
+            results[index] = (filename, text, status)
+    
+    return results
+
+
+def _process_one(file_path: str, preprocessing_method: str, threshold_value: int,
+                 roi_rect: Optional[Tuple[int, int, int, int]],
+                 language: str) -> Tuple[str, str, str]:
+    """
+    Load, preprocess and OCR a single file.
+    
+    Returns:
+        Tuple of (filename, text, status)
+    """
+    return _process_chunk([file_path], preprocessing_method, threshold_value,
+                          roi_rect, language)[0]
+
 
 class BatchProcessor(QThread):
     """
     Thread-based batch processor for OCR operations.
     
+    Files are fanned out over a process pool, one single-threaded
+    Tesseract per worker, and reported in completion order.
+    
     Signals:
         progress_updated: Emitted when progress changes (int: percentage)
         file_processed: Emitted when a file is processed (str: filename, str: text, str: status)
+        batch_processed: Emitted once per finished chunk of files
+            (list of (filename, text, status) tuples); GUIs should prefer it
+            over file_processed to keep cross-thread signal traffic low
         finished_processing: Emitted when all processing is complete
     """
     
     progress_updated = pyqtSignal(int)
     file_processed = pyqtSignal(str, str, str)  # filename, text, status
+    batch_processed = pyqtSignal(list)  # [(filename, text, status), ...]
     finished_processing = pyqtSignal()
     
     def __init__(self, file_paths: List[str], preprocessing_method: str, 
                  threshold_value: int, roi_rect: Optional[Tuple[int, int, int, int]] = None,
-                 language: str = "eng"):
+                 language: str = "eng", cache_path: Optional[str] = None):
         """
         Initialize batch processor.
         
@@ -41,6 +301,8 @@ class BatchProcessor(QThread):
             preprocessing_method: Preprocessing method to apply
             threshold_value: Threshold value for binary threshold
             roi_rect: Optional ROI rectangle (x1, y1, x2, y2)
+            cache_path: Optional OCR cache database; files already recognized
+                with the same settings are answered from it
         """
         super().__init__()
         self.file_paths = file_paths
@@ -48,6 +310,7 @@ class BatchProcessor(QThread):
         self.threshold_value = threshold_value
         self.roi_rect = roi_rect
         self.language = language
+        self.cache_path = cache_path
         self.is_cancelled = False
         
         logger.info(f"Initialized batch processor for {len(file_paths)} files")
@@ -62,121 +325,158 @@ class BatchProcessor(QThread):
         total_files = len(self.file_paths)
         logger.info(f"Starting batch processing of {total_files} files")
         
-        for i, file_path in enumerate(self.file_paths):
-            if self.is_cancelled:
-                logger.info("Processing cancelled")
-                break
-                
-            try:
-                filename = os.path.basename(file_path)
-                logger.debug(f"Processing file: {filename}")
-                
-                # Load and process image
-                image = cv2.imread(file_path)
-                if image is None:
-                    error_msg = "Could not load image"
-                    logger.warning(f"Failed to load {filename}: {error_msg}")
-                    self.file_processed.emit(filename, "", f"Error: {error_msg}")
+        cache = self._open_cache()
+        try:
+            self._process_files(self.file_paths, total_files, cache)
+        finally:
+            if cache is not None:
+                cache.prune()
+                cache.close()
+        
+        logger.info("Batch processing completed")
+        self.finished_processing.emit()
+    
+    def _open_cache(self) -> Optional[OCRCache]:
+        """Open the OCR cache in this thread, or return None if there is none."""
+        if not self.cache_path:
+            return None
+        try:
+            return OCRCache(self.cache_path)
+        except Exception as e:
+            logger.warning(f"OCR cache unavailable: {e}")
+            return None
+    
+    def _emit_results(self, results: List[Tuple[str, str, str]], processed: int,
+                      total_files: int) -> int:
+        """Emit one chunk of results and the new progress; returns the new processed count."""
+        self.batch_processed.emit(results)
+        for filename, text, status in results:
+            self.file_processed.emit(filename, text, status)
+        
+        # Update progress
+        processed += len(results)
+        progress = int(processed / total_files * 100)
+        self.progress_updated.emit(progress)
+        return processed
+    
+    def _lookup_cached(self, file_paths: List[str], cache: Optional[OCRCache]
+                       ) -> Tuple[Dict[str, Optional[str]], List[Tuple[str, str, str]], List[str]]:
+        """
+        Hash a chunk of files and answer what the cache can.
+        
+        Returns:
+            Cache key per path, results of the cached files and the paths
+            that still need OCR
+        """
+        if cache is None:
+            return {}, [], file_paths
+        keys = {path: cache.make_key(path, self.preprocessing_method, self.threshold_value,
+                                     self.roi_rect, self.language)
+                for path in file_paths}
+        cached = cache.get_many({key for key in keys.values() if key is not None})
+        results = []
+        pending = []
+        for path in file_paths:
+            text = cached.get(keys[path])
+            if text is None:
+                pending.append(path)
+            else:
+                results.append((os.path.basename(path), text,
+                                "Success" if text else "No text detected"))
+        return keys, results, pending
+    
+    def _process_files(self, file_paths: List[str], total_files: int,
+                       cache: Optional[OCRCache]) -> None:
+        """
+        OCR files on a process pool, emitting and caching results per chunk.
+        
+        Files are hashed for the cache one chunk at a time, just ahead of
+        the pool, so the first results don't wait for the whole batch to be
+        read. The pool is only started once some file needs OCR.
+        """
+        cpu_count = os.cpu_count() or 1
+        workers = max(1, min(len(file_paths), cpu_count))
+        cv_threads = max(1, cpu_count // workers)
+        # Big enough to amortize Tesseract start-up, small enough to keep every worker busy
+        chunk_size = max(1, min(BATCH_OCR_CHUNK_SIZE, -(-len(file_paths) // workers)))
+        chunks = (file_paths[i:i + chunk_size]
+                  for i in range(0, len(file_paths), chunk_size))
+        
+        processed = 0
+        executor: Optional[ProcessPoolExecutor] = None
+        # Future -> (paths it OCRs, their cache keys)
+        in_flight: Dict[Future, Tuple[List[str], Dict[str, Optional[str]]]] = {}
+        
+        try:
+            for chunk in chunks:
+                if self.is_cancelled:
+                    break
+                keys, results, pending = self._lookup_cached(chunk, cache)
+                if results:
+                    processed = self._emit_results(results, processed, total_files)
+                if not pending:
                     continue
                 
-                # Apply preprocessing
-                processed_image = self._apply_preprocessing(image)
-                
-                # Apply ROI if specified
-                if self.roi_rect:
-                    processed_image = self._apply_roi(processed_image)
-                
-                # Run OCR
-                text, status = self._run_ocr(processed_image)
-                
-                logger.debug(f"Processed {filename}: {status}")
-                self.file_processed.emit(filename, text, status)
+                if executor is None:
+                    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                                   initargs=(cv_threads,))
+                future = executor.submit(_process_chunk, pending, self.preprocessing_method,
+                                         self.threshold_value, self.roi_rect, self.language)
+                in_flight[future] = (pending, keys)
                 
+                # Keep hashing only a little ahead of the workers
+                if len(in_flight) >= 2 * workers:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    processed = self._collect_results(done, in_flight, processed,
+                                                      total_files, cache)
+            
+            while in_flight and not self.is_cancelled:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                processed = self._collect_results(done, in_flight, processed,
+                                                  total_files, cache)
+            
+            if self.is_cancelled:
+                logger.info("Processing cancelled")
+        finally:
+            if executor is not None:
+                for future in in_flight:
+                    future.cancel()
+                executor.shutdown()
+    
+    def _collect_results(self, futures: Iterable[Future],
+                         in_flight: Dict[Future, Tuple[List[str], Dict[str, Optional[str]]]],
+                         processed: int, total_files: int,
+                         cache: Optional[OCRCache]) -> int:
+        """Emit and cache the results of finished chunks; returns the new processed count."""
+        for future in futures:
+            paths, keys = in_flight.pop(future)
+            try:
+                results = future.result()
             except Exception as e:
-                error_msg = f"Error: {str(e)}"
-                logger.error(f"Failed to process {filename}: {error_msg}")
-                self.file_processed.emit(os.path.basename(file_path), "", error_msg)
+                # The worker itself died (e.g. a crash inside Tesseract)
+                logger.error(f"Failed to process chunk: {e}")
+                results = [(os.path.basename(file_path), "", f"Error: {str(e)}")
+                           for file_path in paths]
             
-            # Update progress
-            progress = int((i + 1) / total_files * 100)
-            self.progress_updated.emit(progress)
-        
-        logger.info("Batch processing completed")
-        self.finished_processing.emit()
+            processed = self._emit_results(results, processed, total_files)
+            
+            if cache is not None:
+                # Errors are not cached so that they are retried next time
+                cache.put_many([
+                    (keys[path], text)
+                    for path, (_, text, status) in zip(paths, results)
+                    if keys.get(path) and status in ("Success", "No text detected")
+                ])
+        return processed
     
     def _apply_preprocessing(self, img: np.ndarray) -> np.ndarray:
         """Apply preprocessing to image."""
-        if self.preprocessing_method == 'Grayscale':
-            return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        elif self.preprocessing_method == 'Threshold':
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            _, processed = cv2.threshold(gray, self.threshold_value, 255, cv2.THRESH_BINARY)
-            return processed
-        elif self.preprocessing_method == 'Adaptive Threshold':
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            return cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-                                       cv2.THRESH_BINARY, 11, 2)
-        elif self.preprocessing_method == 'Denoise':
-            return cv2.fastNlMeansDenoisingColored(img, None, 10, 10, 7, 21)
-        elif self.preprocessing_method == 'Auto Rotate':
-            return self._auto_rotate(img)
-        elif self.preprocessing_method == 'Deskew':
-            return self._deskew_image(img)
-        elif self.preprocessing_method == 'Perspective Correction':
-            return self._correct_perspective(img)
-        else:
-            return img
-    
-    def _auto_rotate(self, img: np.ndarray) -> np.ndarray:
-        """Auto-rotate image based on text orientation."""
-        from ..core.image_processor import ImageProcessor
-        return ImageProcessor._auto_rotate(img)
-    
-    def _deskew_image(self, img: np.ndarray) -> np.ndarray:
-        """Deskew image using Hough line detection."""
-        from ..core.image_processor import ImageProcessor
-        return ImageProcessor._deskew_image(img)
-    
-    def _correct_perspective(self, img: np.ndarray) -> np.ndarray:
-        """Correct perspective distortion using contour detection."""
-        from ..core.image_processor import ImageProcessor
-        return ImageProcessor._correct_perspective(img)
+        return _preprocess(img, self.preprocessing_method, self.threshold_value)
     
     def _apply_roi(self, img: np.ndarray) -> np.ndarray:
         """Apply ROI to image."""
-        if not self.roi_rect:
-            return img
-            
-        x1, y1, x2, y2 = self.roi_rect
-        h, w = img.shape[:2]
-        
-        # Ensure ROI is within image bounds
-        x1, y1 = max(0, x1), max(0, y1)
-        x2, y2 = min(w, x2), min(h, y2)
-        
-        if x2 > x1 and y2 > y1:
-            return img[y1:y2, x1:x2]
-        else:
-            logger.warning("Invalid ROI coordinates, using full image")
-            return img
+        return _crop_roi(img, self.roi_rect)
     
     def _run_ocr(self, img: np.ndarray) -> Tuple[str, str]:
         """Run OCR on processed image."""
-        try:
-            # Convert to PIL Image
-            if len(img.shape) == 2:
-                pil_image = Image.fromarray(img)
-            else:
-                rgb_image = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-                pil_image = Image.fromarray(rgb_image)
-            
-            # Run OCR with configuration
-            custom_config = f'--oem 3 --psm {DEFAULT_OCR_CONFIG["page_segmentation_mode"]}'
-            text = pytesseract.image_to_string(pil_image, lang=self.language, config=custom_config).strip()
-            
-            status = "Success" if text else "No text detected"
-            return text, status
-            
-        except Exception as e:
-            logger.error(f"OCR failed: {e}")
-            return "", f"OCR Error: {str(e)}"
\ No newline at end of file
+        return _ocr(img, self.language)
@@ -2,46 +2,178 @@
 Image processing utilities for OCR Scanner.
 """
 
+import heapq
 import logging
-from typing import Tuple, Optional
+import math
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Dict, List, Tuple, Optional
 import cv2
 import numpy as np
 import pytesseract
 from PIL import Image
 
 from ..config.settings import DEFAULT_OCR_CONFIG
+from .preprocessing_ops import PREPROCESSING_OPS
+
+try:
+    from tesserocr import PyTessBaseAPI, RIL
+except ImportError:  # optional in-process engine, pytesseract is the fallback
+    PyTessBaseAPI = None
 
 logger = logging.getLogger(__name__)
 
+# Resolve the Tesseract binary once rather than searching PATH on every
+# spawn; an explicitly configured command is left alone
+if pytesseract.pytesseract.tesseract_cmd == 'tesseract':
+    pytesseract.pytesseract.tesseract_cmd = shutil.which('tesseract') or 'tesseract'
+
+# Resident Tesseract engines keyed by (language, psm), None where the engine
+# failed to initialize. An engine is not re-entrant, so lookups and
+# recognition both hold the lock (the batch tab runs in its own QThread)
+_API_CACHE: Dict[Tuple[str, int], Optional["PyTessBaseAPI"]] = {}
+_API_LOCK = threading.Lock()
+# Tesseract's own default page segmentation, used for word boxes
+_PSM_AUTO = 3
+
+# Constants for the per-image geometry corrections, built once at import
+_MORPH_3X3 = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+# Below this intensity spread a page has no edges worth finding
+_MIN_EDGE_STD = 8.0
+_HOUGH_THETA = np.pi / 180
+_RAD_TO_DEG = 180 / np.pi
+
+
+def _get_api(language: str, psm: int) -> Optional["PyTessBaseAPI"]:
+    """
+    Get the resident Tesseract engine for a language and segmentation mode.
+    
+    Must be called with _API_LOCK held. Returns None when tesserocr is not
+    installed or the engine can't be initialized, in which case the
+    pytesseract CLI is used. A failed initialization is remembered, so it
+    is only attempted (and logged) once per language and mode.
+    """
+    if PyTessBaseAPI is None:
+        return None
+    key = (language, psm)
+    if key not in _API_CACHE:
+        try:
+            # tesserocr takes the plain PSM value; the engine mode defaults
+            # to OEM.DEFAULT
+            _API_CACHE[key] = PyTessBaseAPI(lang=language, psm=psm)
+        except Exception as e:
+            logger.warning(f"tesserocr unavailable for '{language}', using pytesseract: {e}")
+            _API_CACHE[key] = None
+    return _API_CACHE[key]
+
+
+def _limit_size(img: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Downscale an image whose long side exceeds the OCR size cap.
+    
+    Returns:
+        The (possibly resized) image and the scale factor applied to it
+    """
+    max_dim = DEFAULT_OCR_CONFIG["max_ocr_dim"]
+    h, w = img.shape[:2]
+    long_side = max(h, w)
+    if long_side <= max_dim:
+        return img, 1.0
+    scale = max_dim / long_side
+    resized = cv2.resize(img, (max(1, round(w * scale)), max(1, round(h * scale))),
+                         interpolation=cv2.INTER_AREA)
+    return resized, scale
+
+
+def _to_pil_gray(img: np.ndarray) -> Image.Image:
+    """
+    Wrap an image as an 8-bit grayscale PIL image for Tesseract.
+    
+    Tesseract binarizes luminance anyway, so colour input is converted to
+    gray instead of swapped to RGB. The gray pixels are shared with PIL,
+    not copied; only non-contiguous views (e.g. an ROI crop) are packed
+    first.
+    """
+    gray = img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    gray = np.ascontiguousarray(gray)
+    height, width = gray.shape
+    return Image.frombuffer('L', (width, height), gray, 'raw', 'L', 0, 1)
+
+
+def ocr_page_files(page_paths: List[str], list_path: str, language: str) -> Optional[List[str]]:
+    """
+    OCR several image files with a single Tesseract run.
+    
+    Tesseract treats a text file of image paths as a multi-page input and
+    ends every page with a form feed, so the output splits back into one
+    text per image.
+    
+    Args:
+        page_paths: Image files to recognize
+        list_path: Where to write the list of image paths
+        language: OCR language
+        
+    Returns:
+        One stripped text per page, or None if the output can't be split
+    """
+    with open(list_path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(page_paths) + "\n")
+    
+    config = f'--oem 3 --psm {DEFAULT_OCR_CONFIG["page_segmentation_mode"]}'
+    output = pytesseract.image_to_string(list_path, lang=language, config=config)
+    pages = output.split('\f')
+    if len(pages) < len(page_paths):
+        logger.warning(f"Expected {len(page_paths)} pages from Tesseract, got {len(pages)}")
+        return None
+    return [page.strip() for page in pages[:len(page_paths)]]
+
+
+def _collect_words(api: "PyTessBaseAPI") -> Dict[str, list]:
+    """Walk the recognized words into pytesseract's image_to_data dict layout."""
+    data = {'text': [], 'conf': [], 'left': [], 'top': [], 'width': [], 'height': []}
+    it = api.GetIterator()
+    if it is None:
+        return data
+    while True:
+        box = it.BoundingBox(RIL.WORD)
+        if box is not None:
+            x1, y1, x2, y2 = box
+            data['text'].append(it.GetUTF8Text(RIL.WORD) or '')
+            data['conf'].append(it.Confidence(RIL.WORD))
+            data['left'].append(x1)
+            data['top'].append(y1)
+            data['width'].append(x2 - x1)
+            data['height'].append(y2 - y1)
+        if not it.Next(RIL.WORD):
+            break
+    return data
+
 
 class ImageProcessor:
     """Handles image processing operations for OCR."""
     
     @staticmethod
-    def apply_preprocessing(img: np.ndarray, method: str, threshold_value: int = 127) -> np.ndarray:
+    def apply_preprocessing(img: np.ndarray, method: str, threshold_value: int = 127,
+                            dst: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Apply preprocessing to image.
         
         Args:
-            img: Input image
+            img: Input image (BGR, or grayscale for the luminance-only methods)
             method: Preprocessing method
             threshold_value: Threshold value for binary threshold
+            dst: Optional single-channel buffer of the image's size that the
+                luminance-only methods write into instead of allocating
             
         Returns:
             Processed image
         """
-        if method == 'Grayscale':
-            return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        elif method == 'Threshold':
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            _, processed = cv2.threshold(gray, threshold_value, 255, cv2.THRESH_BINARY)
-            return processed
-        elif method == 'Adaptive Threshold':
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            return cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-                                       cv2.THRESH_BINARY, 11, 2)
-        elif method == 'Denoise':
-            return cv2.fastNlMeansDenoisingColored(img, None, 10, 10, 7, 21)
+        op = PREPROCESSING_OPS.get(method)
+        if op is not None:
+            return op(img, threshold_value, dst)
         elif method == 'Auto Rotate':
             return ImageProcessor._auto_rotate(img)
         elif method == 'Deskew':
@@ -66,6 +198,13 @@ class ImageProcessor:
             osd = pytesseract.image_to_osd(gray, output_type=pytesseract.Output.DICT)
             angle = osd.get('rotate', 0)
             
+            if angle in (90, 180, 270):
+                # OSD reports quarter turns (clockwise to upright): a strided
+                # copy instead of a bicubic warp, and width/height swap properly
+                rotated = np.ascontiguousarray(np.rot90(img, -(angle // 90)))
+                logger.info(f"Auto-rotated image by {angle} degrees")
+                return rotated
+            
             if angle != 0:
                 # Rotate image
                 (h, w) = img.shape[:2]
@@ -88,24 +227,25 @@ class ImageProcessor:
             if len(img.shape) == 3:
                 gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
             else:
-                gray = img.copy()
+                gray = img
+            
+            # Near-uniform pages can't yield Hough lines; skip Canny and Hough
+            if gray.std() < _MIN_EDGE_STD:
+                return img
             
             # Edge detection
             edges = cv2.Canny(gray, 50, 150, apertureSize=3)
             
             # Hough line detection
-            lines = cv2.HoughLines(edges, 1, np.pi/180, threshold=100)
+            lines = cv2.HoughLines(edges, 1, _HOUGH_THETA, threshold=100)
             
             if lines is not None:
-                # Calculate average angle
-                angles = []
-                for rho, theta in lines[:10]:  # Use first 10 lines
-                    angle = theta * 180 / np.pi - 90
-                    if abs(angle) < 45:  # Only consider reasonable angles
-                        angles.append(angle)
+                # Average angle of the first 10 lines (lines is N x 1 x (rho, theta))
+                angles = lines[:10, 0, 1] * _RAD_TO_DEG - 90
+                angles = angles[np.abs(angles) < 45]  # Only consider reasonable angles
                 
-                if angles:
-                    avg_angle = np.mean(angles)
+                if angles.size:
+                    avg_angle = float(angles.mean())
                     
                     # Rotate image
                     (h, w) = img.shape[:2]
@@ -132,19 +272,25 @@ class ImageProcessor:
             
             # Edge detection and morphology
             edges = cv2.Canny(gray, 50, 150)
-            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
-            edges = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, kernel)
+            edges = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, _MORPH_3X3)
             
             # Find contours
             contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
             
             # Find the largest rectangular contour
-            for contour in sorted(contours, key=cv2.contourArea, reverse=True)[:5]:
+            for contour in heapq.nlargest(5, contours, key=cv2.contourArea):
                 epsilon = 0.02 * cv2.arcLength(contour, True)
                 approx = cv2.approxPolyDP(contour, epsilon, True)
                 
                 if len(approx) == 4:
-                    # Found a quadrilateral
+                    # Found a quadrilateral; if it already spans the frame
+                    # with the frame's aspect ratio, the page is flat
+                    _, _, bw, bh = cv2.boundingRect(approx)
+                    img_h, img_w = img.shape[:2]
+                    if (bh > 0 and abs(bw / bh - img_w / img_h) < 0.02
+                            and bw * bh > 0.9 * img_w * img_h):
+                        return img
+                    
                     pts = approx.reshape(4, 2).astype(np.float32)
                     
                     # Order points: top-left, top-right, bottom-right, bottom-left
@@ -158,13 +304,14 @@ class ImageProcessor:
                     rect[3] = pts[np.argmax(diff)]  # bottom-left
                     
                     # Calculate dimensions
+                    (tl_x, tl_y), (tr_x, tr_y), (br_x, br_y), (bl_x, bl_y) = rect.tolist()
                     width = max(
-                        np.linalg.norm(rect[1] - rect[0]),
-                        np.linalg.norm(rect[2] - rect[3])
+                        math.hypot(tr_x - tl_x, tr_y - tl_y),
+                        math.hypot(br_x - bl_x, br_y - bl_y)
                     )
                     height = max(
-                        np.linalg.norm(rect[3] - rect[0]),
-                        np.linalg.norm(rect[2] - rect[1])
+                        math.hypot(bl_x - tl_x, bl_y - tl_y),
+                        math.hypot(br_x - tr_x, br_y - tr_y)
                     )
                     
                     # Destination points
@@ -223,15 +370,18 @@ class ImageProcessor:
             Extracted text
         """
         try:
-            # Convert to PIL Image
-            if len(img.shape) == 2:
-                pil_image = Image.fromarray(img)
-            else:
-                rgb_image = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-                pil_image = Image.fromarray(rgb_image)
+            img, _ = _limit_size(img)
+            pil_image = _to_pil_gray(img)
+            psm = DEFAULT_OCR_CONFIG["page_segmentation_mode"]
+            
+            with _API_LOCK:
+                api = _get_api(language, psm)
+                if api is not None:
+                    api.SetImage(pil_image)
+                    return api.GetUTF8Text().strip()
             
             # Run OCR with configuration
-            custom_config = f'--oem 3 --psm {DEFAULT_OCR_CONFIG["page_segmentation_mode"]}'
+            custom_config = f'--oem 3 --psm {psm}'
             text = pytesseract.image_to_string(pil_image, lang=language, config=custom_config)
             return text.strip()
             
@@ -239,6 +389,74 @@ class ImageProcessor:
             logger.error(f"OCR failed: {e}")
             raise
     
+    @staticmethod
+    def run_ocr_batch(images: List[np.ndarray], language: str = "eng") -> List[str]:
+        """
+        Run OCR on several images with a single engine start.
+        
+        The resident engine (tesserocr) reads the images one after another;
+        the CLI gets them as one multi-page job, listed in a text file, so
+        Tesseract starts and loads its language data only once.
+        
+        Args:
+            images: Input images
+            language: OCR language
+            
+        Returns:
+            Extracted text of each image, in input order
+        """
+        if not images:
+            return []
+        
+        try:
+            pil_images = [_to_pil_gray(_limit_size(img)[0]) for img in images]
+            psm = DEFAULT_OCR_CONFIG["page_segmentation_mode"]
+            
+            with _API_LOCK:
+                api = _get_api(language, psm)
+                if api is not None:
+                    texts = []
+                    for pil_image in pil_images:
+                        api.SetImage(pil_image)
+                        texts.append(api.GetUTF8Text().strip())
+                    return texts
+            
+            with tempfile.TemporaryDirectory(prefix="ocr_batch_") as tmp_dir:
+                page_paths = []
+                for i, pil_image in enumerate(pil_images):
+                    page_path = os.path.join(tmp_dir, f"page_{i}.png")
+                    pil_image.save(page_path, compress_level=1)
+                    page_paths.append(page_path)
+                texts = ocr_page_files(page_paths, os.path.join(tmp_dir, "pages.txt"), language)
+            
+            if texts is None:
+                raise RuntimeError("Tesseract output did not split into one text per image")
+            return texts
+            
+        except Exception as e:
+            logger.error(f"Batch OCR failed: {e}")
+            raise
+    
+    @staticmethod
+    def warm_up(language: str = "eng") -> None:
+        """
+        Run a tiny OCR so the first real call doesn't pay the engine start-up.
+        
+        Loads the resident engine (tesserocr) or pulls the Tesseract binary
+        and language data into the OS cache (CLI). Meant for a background
+        thread; failures are only logged.
+        
+        Args:
+            language: Language whose data to load
+        """
+        start = time.perf_counter()
+        try:
+            ImageProcessor.run_ocr(np.zeros((32, 32), dtype=np.uint8), language)
+        except Exception as e:
+            logger.debug(f"OCR warm-up failed: {e}")
+            return
+        logger.debug(f"OCR engine warmed up in {(time.perf_counter() - start) * 1000:.0f} ms")
+    
     @staticmethod
     def get_text_boxes(img: np.ndarray, confidence_threshold: int = None, language: str = "eng") -> dict:
         """
@@ -255,15 +473,25 @@ class ImageProcessor:
             confidence_threshold = DEFAULT_OCR_CONFIG["confidence_threshold"]
             
         try:
-            # Convert to PIL Image
-            if len(img.shape) == 2:
-                pil_image = Image.fromarray(img)
-            else:
-                rgb_image = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-                pil_image = Image.fromarray(rgb_image)
+            img, scale = _limit_size(img)
+            pil_image = _to_pil_gray(img)
+            
+            data = None
+            with _API_LOCK:
+                api = _get_api(language, _PSM_AUTO)
+                if api is not None:
+                    api.SetImage(pil_image)
+                    api.Recognize()
+                    data = _collect_words(api)
+            
+            if data is None:
+                # Get bounding box data
+                data = pytesseract.image_to_data(pil_image, lang=language, output_type=pytesseract.Output.DICT)
             
-            # Get bounding box data
-            data = pytesseract.image_to_data(pil_image, lang=language, output_type=pytesseract.Output.DICT)
+            if scale != 1.0:
+                # Report boxes in the caller's image coordinates
+                for key in ('left', 'top', 'width', 'height'):
+                    data[key] = [round(v / scale) for v in data[key]]
             return data
             
         except Exception as e:
@@ -0,0 +1,133 @@
+"""
+Persistent cache of OCR results for batch processing.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..config.settings import DEFAULT_OCR_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# SQLite's default limit on host parameters per statement is 999
+_MAX_QUERY_PARAMS = 500
+_READ_SIZE = 1 << 20
+
+# Pruning bounds: entries written longer ago than this are dropped, and of
+# the rest only the most recently written are kept
+CACHE_MAX_AGE_SECONDS = 90 * 24 * 60 * 60
+CACHE_MAX_ENTRIES = 100_000
+
+
+def file_digest(file_path: str) -> str:
+    """Hash a file's contents (BLAKE2b, 128-bit hex digest)."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(_READ_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class OCRCache:
+    """
+    SQLite-backed store of OCR text keyed by file content and OCR settings.
+
+    Identical files (re-runs, or copies in several folders) are only
+    recognized once per combination of preprocessing, ROI and language.
+    A connection belongs to the thread that opened it.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Open (and create if needed) a cache database.
+
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self._conn = sqlite3.connect(str(db_path))
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ocr_results "
+            "(key TEXT PRIMARY KEY, text TEXT NOT NULL, ts INTEGER NOT NULL)")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ocr_results_ts ON ocr_results (ts)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(file_path: str, preprocessing_method: str, threshold_value: int,
+                 roi_rect: Optional[Tuple[int, int, int, int]], language: str) -> Optional[str]:
+        """
+        Build the cache key for OCR'ing a file with the given settings.
+
+        The page segmentation mode comes from DEFAULT_OCR_CONFIG, as it does
+        for the batch OCR itself.
+
+        Returns:
+            The key, or None if the file can't be read
+        """
+        try:
+            content = file_digest(file_path)
+        except OSError as e:
+            logger.debug(f"Not caching {file_path}: {e}")
+            return None
+        psm = DEFAULT_OCR_CONFIG["page_segmentation_mode"]
+        return f"{content}|{preprocessing_method}|{threshold_value}|{roi_rect}|{language}|{psm}"
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """
+        Look up cached texts.
+
+        Returns:
+            Mapping of key to OCR text for the keys that are cached
+        """
+        keys = list(keys)
+        found = {}
+        for start in range(0, len(keys), _MAX_QUERY_PARAMS):
+            batch = keys[start:start + _MAX_QUERY_PARAMS]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                f"SELECT key, text FROM ocr_results WHERE key IN ({placeholders})", batch)
+            found.update(rows)
+        return found
+
+    def put_many(self, entries: List[Tuple[str, str]]) -> None:
+        """Store (key, text) pairs, replacing any existing entries."""
+        if not entries:
+            return
+        now = int(time.time())
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO ocr_results (key, text, ts) VALUES (?, ?, ?)",
+                [(key, text, now) for key, text in entries])
+
+    def prune(self, max_age: int = CACHE_MAX_AGE_SECONDS,
+              max_entries: int = CACHE_MAX_ENTRIES) -> int:
+        """
+        Drop entries older than max_age seconds, then all but the newest max_entries.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._conn:
+            removed = self._conn.execute(
+                "DELETE FROM ocr_results WHERE ts < ?",
+                (int(time.time()) - max_age,)).rowcount
+            removed += self._conn.execute(
+                "DELETE FROM ocr_results WHERE key IN "
+                "(SELECT key FROM ocr_results ORDER BY ts DESC LIMIT -1 OFFSET ?)",
+                (max_entries,)).rowcount
+        if removed:
+            logger.info(f"Pruned {removed} entries from the OCR cache")
+        return removed
+
+    def clear(self) -> None:
+        """Remove every cached result."""
+        with self._conn:
+            self._conn.execute("DELETE FROM ocr_results")
+        logger.info("OCR cache cleared")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
@@ -0,0 +1,90 @@
+"""
+Pixel-level preprocessing operations shared by the single-image and batch paths.
+
+The neighbourhood filters run through OpenCV's transparent API (UMat) when
+OpenCL is enabled, so a GPU takes them over where one is available.
+"""
+
+from typing import Callable, Dict, Optional
+import cv2
+import numpy as np
+
+# Methods that only need luminance; batch inputs for them are decoded
+# straight to grayscale
+GRAY_METHODS = ('Grayscale', 'Threshold', 'Adaptive Threshold')
+
+# Methods whose output pixel depends only on the same input pixel, so
+# cropping to an ROI before or after them gives the same result
+POINTWISE_METHODS = ('None', 'Grayscale', 'Threshold')
+
+
+def to_gray(img: np.ndarray, dst: Optional[np.ndarray] = None) -> np.ndarray:
+    """Return a grayscale view of an image, converting only if it is BGR."""
+    if len(img.shape) == 2:
+        return img
+    return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY, dst=dst)
+
+
+def _grayscale(img: np.ndarray, threshold_value: int,
+               dst: Optional[np.ndarray]) -> np.ndarray:
+    return to_gray(img, dst)
+
+
+def _threshold(img: np.ndarray, threshold_value: int,
+               dst: Optional[np.ndarray]) -> np.ndarray:
+    gray = to_gray(img, dst)
+    # A freshly converted gray buffer is ours to threshold in place; the
+    # caller's own grayscale image is not
+    out = dst if gray is img else gray
+    _, processed = cv2.threshold(gray, threshold_value, 255, cv2.THRESH_BINARY, dst=out)
+    return processed
+
+
+def _adaptive_threshold(img: np.ndarray, threshold_value: int,
+                        dst: Optional[np.ndarray]) -> np.ndarray:
+    if cv2.ocl.useOpenCL():
+        src = cv2.UMat(img)
+        if img.ndim == 3:
+            src = cv2.cvtColor(src, cv2.COLOR_BGR2GRAY)
+        result = cv2.adaptiveThreshold(src, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                       cv2.THRESH_BINARY, 11, 2).get()
+        if dst is None:
+            return result
+        np.copyto(dst, result)
+        return dst
+    gray = to_gray(img, dst)
+    # Each output pixel only depends on its own input pixel and the blurred
+    # mean, so the converted buffer can be overwritten in place too
+    out = dst if gray is img else gray
+    return cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                 cv2.THRESH_BINARY, 11, 2, dst=out)
+
+
+def _denoise(img: np.ndarray, threshold_value: int,
+             dst: Optional[np.ndarray]) -> np.ndarray:
+    if len(img.shape) == 2:
+        if cv2.ocl.useOpenCL():
+            return cv2.fastNlMeansDenoising(cv2.UMat(img), None, 10, 7, 21).get()
+        return cv2.fastNlMeansDenoising(img, None, 10, 7, 21)
+    # The colour variant has no OpenCL kernel
+    return cv2.fastNlMeansDenoisingColored(img, None, 10, 10, 7, 21)
+
+
+def _bilateral(img: np.ndarray, threshold_value: int,
+               dst: Optional[np.ndarray]) -> np.ndarray:
+    # Edge-preserving smoothing at a fraction of non-local means' cost
+    if cv2.ocl.useOpenCL():
+        return cv2.bilateralFilter(cv2.UMat(img), 7, 50, 50).get()
+    return cv2.bilateralFilter(img, 7, 50, 50)
+
+
+# method name -> op(img, threshold_value, dst); dst is an optional
+# single-channel buffer of the image's size that the luminance-only ops
+# write into instead of allocating
+PREPROCESSING_OPS: Dict[str, Callable[[np.ndarray, int, Optional[np.ndarray]], np.ndarray]] = {
+    'Grayscale': _grayscale,
+    'Threshold': _threshold,
+    'Adaptive Threshold': _adaptive_threshold,
+    'Denoise': _denoise,
+    'Bilateral Filter': _bilateral,
+}
@@ -11,14 +11,21 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QProgressBar, QListWidget, QCheckBox, QMessageBox,
                              QTableWidget, QTableWidgetItem, QHeaderView, 
                              QAbstractItemView)
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 
 from ..core.batch_processor import BatchProcessor
+from ..core.ocr_cache import OCRCache
 from ..utils.export import ResultExporter
-from ..config.settings import IMAGE_FILTER, PREPROCESSING_OPTIONS, EXPORT_FORMATS, SUPPORTED_LANGUAGES
+from ..config.settings import (IMAGE_FILTER, PREPROCESSING_OPTIONS, EXPORT_FORMATS,
+                               LANGUAGE_ITEMS, get_ocr_cache_path)
 
 logger = logging.getLogger(__name__)
 
+# Results are shown in the table at most this often (ms), or as soon as
+# this many rows are waiting
+RESULTS_FLUSH_INTERVAL = 100
+RESULTS_FLUSH_ROWS = 32
+
 
 class BatchProcessingTab(QWidget):
     """Tab for batch processing multiple images."""
@@ -30,6 +37,13 @@ class BatchProcessingTab(QWidget):
         self.batch_results = []
         self.batch_file_paths = []
         
+        # Table rows not yet shown, as (filename, status, display_text)
+        self._pending_rows = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(RESULTS_FLUSH_INTERVAL)
+        self._flush_timer.timeout.connect(self._flush_rows)
+        
         self.init_ui()
     
     def init_ui(self):
@@ -51,6 +65,10 @@ class BatchProcessingTab(QWidget):
         self.batch_clear_btn.clicked.connect(self.clear_batch_list)
         file_layout.addWidget(self.batch_clear_btn)
         
+        self.batch_clear_cache_btn = QPushButton('Clear OCR Cache')
+        self.batch_clear_cache_btn.clicked.connect(self.clear_ocr_cache)
+        file_layout.addWidget(self.batch_clear_cache_btn)
+        
         file_layout.addWidget(QLabel('Selected Files:'))
         self.file_list = QListWidget()
         self.file_list.setMaximumHeight(150)
@@ -76,8 +94,8 @@ class BatchProcessingTab(QWidget):
         batch_preprocess_layout.addWidget(self.batch_threshold_slider)
         self.batch_threshold_label = QLabel('127')
         batch_preprocess_layout.addWidget(self.batch_threshold_label)
-        self.batch_threshold_slider.valueChanged.connect(
-            lambda v: self.batch_threshold_label.setText(str(v)))
+        # Straight to the C++ slot, no Python call per slider tick
+        self.batch_threshold_slider.valueChanged[int].connect(self.batch_threshold_label.setNum)
         
         self.use_roi_checkbox = QCheckBox('Use ROI from Single Image Tab')
         self.use_roi_checkbox.setEnabled(False)
@@ -86,8 +104,8 @@ class BatchProcessingTab(QWidget):
         # Language selection
         batch_preprocess_layout.addWidget(QLabel('Language:'))
         self.batch_language_combo = QComboBox()
-        for code, name in SUPPORTED_LANGUAGES.items():
-            self.batch_language_combo.addItem(f"{name} ({code})", code)
+        for label, code in LANGUAGE_ITEMS:
+            self.batch_language_combo.addItem(label, code)
         self.batch_language_combo.setCurrentText("English (eng)")
         batch_preprocess_layout.addWidget(self.batch_language_combo)
         
@@ -167,11 +185,23 @@ class BatchProcessingTab(QWidget):
         self.batch_file_paths = []
         self.batch_process_btn.setEnabled(False)
         self.use_roi_checkbox.setEnabled(False)
+        self._discard_pending_rows()
         self.results_table.setRowCount(0)
         self.batch_results = []
         self.batch_export_btn.setEnabled(False)
         logger.info("Batch list cleared")
     
+    def clear_ocr_cache(self):
+        """Forget cached OCR results so every file is recognized again."""
+        try:
+            cache = OCRCache(str(get_ocr_cache_path()))
+            cache.clear()
+            cache.close()
+        except Exception as e:
+            QMessageBox.critical(self, "Cache Error",
+                               f"Failed to clear the OCR cache:\n{str(e)}")
+            logger.error(f"Clearing OCR cache failed: {e}")
+    
     def start_batch_processing(self):
         """Start batch processing of selected images."""
         if not self.batch_file_paths:
@@ -187,6 +217,7 @@ class BatchProcessingTab(QWidget):
             roi_rect = self.parent_window.get_roi_rect()
         
         # Clear previous results
+        self._discard_pending_rows()
         self.results_table.setRowCount(0)
         self.batch_results = []
         self.progress_bar.setValue(0)
@@ -196,12 +227,14 @@ class BatchProcessingTab(QWidget):
         self.batch_cancel_btn.setEnabled(True)
         self.batch_load_btn.setEnabled(False)
         self.batch_clear_btn.setEnabled(False)
+        self.batch_clear_cache_btn.setEnabled(False)
         
         # Start batch processor thread
         self.batch_processor = BatchProcessor(
-            self.batch_file_paths, preprocessing_method, threshold_value, roi_rect, language)
+            self.batch_file_paths, preprocessing_method, threshold_value, roi_rect, language,
+            cache_path=str(get_ocr_cache_path()))
         self.batch_processor.progress_updated.connect(self.update_batch_progress)
-        self.batch_processor.file_processed.connect(self.add_batch_result)
+        self.batch_processor.batch_processed.connect(self.add_batch_results)
         self.batch_processor.finished_processing.connect(self.batch_processing_finished)
         self.batch_processor.start()
         
@@ -221,35 +254,81 @@ class BatchProcessingTab(QWidget):
     
     def add_batch_result(self, filename, text, status):
         """Add result to results table."""
-        row = self.results_table.rowCount()
-        self.results_table.insertRow(row)
+        self.add_batch_results([(filename, text, status)])
+    
+    def add_batch_results(self, results):
+        """
+        Add a chunk of (filename, text, status) results.
+        
+        Results are stored right away; their table rows are buffered and
+        shown by _flush_rows, so a fast batch repaints the table a few
+        times per second instead of once per chunk.
+        """
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        for filename, text, status in results:
+            # Truncate text for display but store full text
+            display_text = text[:100] + "..." if len(text) > 100 else text
+            self._pending_rows.append((filename, status, display_text))
+            
+            # Store full result
+            self.batch_results.append({
+                'filename': filename,
+                'text': text,
+                'status': status,
+                'timestamp': timestamp
+            })
+        
+        if len(self._pending_rows) >= RESULTS_FLUSH_ROWS:
+            self._flush_rows()
+        elif not self._flush_timer.isActive():
+            self._flush_timer.start()
+    
+    def _flush_rows(self):
+        """Show all buffered result rows in the table."""
+        self._flush_timer.stop()
+        if not self._pending_rows:
+            return
         
-        # Add items to table
-        self.results_table.setItem(row, 0, QTableWidgetItem(filename))
-        self.results_table.setItem(row, 1, QTableWidgetItem(status))
+        rows, self._pending_rows = self._pending_rows, []
+        header = self.results_table.horizontalHeader()
         
-        # Truncate text for display but store full text
-        display_text = text[:100] + "..." if len(text) > 100 else text
-        self.results_table.setItem(row, 2, QTableWidgetItem(display_text))
+        # Grow the table once and lay it out once for the whole flush;
+        # fit-to-contents columns would otherwise re-measure on every cell
+        self.results_table.setUpdatesEnabled(False)
+        header.setSectionResizeMode(0, QHeaderView.Interactive)
+        header.setSectionResizeMode(1, QHeaderView.Interactive)
+        row = self.results_table.rowCount()
+        self.results_table.setRowCount(row + len(rows))
         
-        # Store full result
-        self.batch_results.append({
-            'filename': filename,
-            'text': text,
-            'status': status,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        })
+        for filename, status, display_text in rows:
+            self.results_table.setItem(row, 0, QTableWidgetItem(filename))
+            self.results_table.setItem(row, 1, QTableWidgetItem(status))
+            self.results_table.setItem(row, 2, QTableWidgetItem(display_text))
+            row += 1
+        
+        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        self.results_table.setUpdatesEnabled(True)
         
         # Auto-scroll to latest result
         self.results_table.scrollToBottom()
     
+    def _discard_pending_rows(self):
+        """Drop buffered rows that haven't been shown yet."""
+        self._flush_timer.stop()
+        self._pending_rows = []
+    
     def batch_processing_finished(self):
         """Handle batch processing completion."""
+        self._flush_rows()
+        
         # Re-enable controls
         self.batch_process_btn.setEnabled(True)
         self.batch_cancel_btn.setEnabled(False)
         self.batch_load_btn.setEnabled(True)
         self.batch_clear_btn.setEnabled(True)
+        self.batch_clear_cache_btn.setEnabled(True)
         
         if self.batch_results:
             self.batch_export_btn.setEnabled(True)
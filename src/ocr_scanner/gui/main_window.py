@@ -4,10 +4,11 @@ Main window for OCR Scanner application.
 
 import logging
 from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QTabWidget
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QThreadPool
 
 from .single_image_tab import SingleImageTab
 from .batch_processing_tab import BatchProcessingTab
+from ..core.image_processor import ImageProcessor
 from ..config.settings import DEFAULT_WINDOW_SIZE
 
 logger = logging.getLogger(__name__)
@@ -46,6 +47,11 @@ class OCRScanner(QMainWindow):
         # Connect signals
         self.single_tab.roi_changed.connect(self.on_roi_changed)
         
+        # Load the OCR engine in the background so the first "Run OCR"
+        # click doesn't stall on it
+        language = self.single_tab.language_combo.currentData()
+        QThreadPool.globalInstance().start(lambda: ImageProcessor.warm_up(language))
+        
         logger.info("Main window initialized")
     
     def on_roi_changed(self, roi_rect):
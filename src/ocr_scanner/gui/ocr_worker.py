@@ -0,0 +1,50 @@
+"""
+Background OCR jobs for the GUI.
+"""
+
+import logging
+from typing import Any, Callable
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+
+class OCRWorkerSignals(QObject):
+    """
+    Signals of an OCRWorker (QRunnable itself can't carry signals).
+
+    Signals:
+        finished: Emitted with the job's result
+        failed: Emitted with the error message if the job raised
+    """
+
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class OCRWorker(QRunnable):
+    """Runs a blocking call (OCR, image decoding) on a QThreadPool thread and reports back via signals."""
+
+    def __init__(self, fn: Callable[..., Any], *args: Any):
+        """
+        Initialize the job.
+
+        Args:
+            fn: Blocking function to run, e.g. ImageProcessor.run_ocr or ImageUtils.load_image
+            *args: Arguments for fn; the worker must own any image buffers
+        """
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = OCRWorkerSignals()
+
+    def run(self) -> None:
+        """Run the job and emit its result or error."""
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            logger.error(f"Background OCR job failed: {e}")
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(result)
@@ -3,21 +3,40 @@ Single image processing tab for OCR Scanner.
 """
 
 import logging
+import sys
+import time
 from typing import Optional, Tuple
 import cv2
+import numpy as np
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                              QLabel, QTextEdit, QFileDialog, QComboBox, 
                              QSlider, QGroupBox)
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal
-from PyQt5.QtGui import QPixmap
+from PyQt5.QtCore import Qt, QRect, QTimer, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QPixmap, QPainter, QPen, QColor
 
 from ..core.image_processor import ImageProcessor
+from .ocr_worker import OCRWorker
 from ..utils.image_utils import ImageUtils
-from ..config.settings import IMAGE_FILTER, PREPROCESSING_OPTIONS, DEFAULT_IMAGE_DISPLAY_SIZE, SUPPORTED_LANGUAGES
+from ..config.settings import IMAGE_FILTER, PREPROCESSING_OPTIONS, DEFAULT_IMAGE_DISPLAY_SIZE, LANGUAGE_ITEMS
 from ..plugins.plugin_manager import plugin_manager
 
 logger = logging.getLogger(__name__)
 
+# Camera preview refresh interval bounds (ms); the interval widens when
+# rendering a frame takes longer than the interval
+CAMERA_MIN_INTERVAL = 30
+CAMERA_MAX_INTERVAL = 200
+# Threshold slider moves are coalesced into one preprocessing run per this many ms
+PREPROCESS_DEBOUNCE_MS = 30
+
+# Native capture backend per platform; the generic one is the fallback
+if sys.platform == 'win32':
+    CAMERA_BACKEND = cv2.CAP_DSHOW
+elif sys.platform.startswith('linux'):
+    CAMERA_BACKEND = cv2.CAP_V4L2
+else:
+    CAMERA_BACKEND = cv2.CAP_ANY
+
 
 class SingleImageTab(QWidget):
     """Tab for single image processing."""
@@ -30,10 +49,29 @@ class SingleImageTab(QWidget):
         self.original_image = None
         self.camera = None
         self.timer = None
+        self._frame_time_ms = 0.0
+        self._frame_buf = None
         self.roi_start = None
         self.roi_end = None
         self.selecting_roi = False
         self.roi_rect = None
+        # Factor the loaded image was reduced by; the ROI sent to the batch
+        # tab is scaled back up, since batch files are read at full size
+        self._load_factor = 1
+        self._roi_dirty = False
+        # Output buffer reused by the luminance-only preprocessing methods,
+        # so dragging the threshold slider doesn't allocate per tick
+        self._preprocess_buf = None
+        # (method, threshold) self.image was last made with; None when stale
+        self._preprocess_key = None
+        # Background OCR job in flight, kept referenced until it reports back
+        self._ocr_job = None
+        self._load_job = None
+        self._overlay_ready = False
+        # Scaled pixmap of self.image and the (image, shape, label size) it
+        # was built for; ROI drags draw on a copy of it instead of rescaling
+        self._base_pixmap = None
+        self._base_pixmap_key = None
         
         self.init_ui()
         
@@ -101,7 +139,11 @@ class SingleImageTab(QWidget):
         self.threshold_slider.setMinimum(0)
         self.threshold_slider.setMaximum(255)
         self.threshold_slider.setValue(127)
-        self.threshold_slider.valueChanged.connect(self.apply_preprocessing)
+        self._preprocess_timer = QTimer(self)
+        self._preprocess_timer.setSingleShot(True)
+        self._preprocess_timer.setInterval(PREPROCESS_DEBOUNCE_MS)
+        self._preprocess_timer.timeout.connect(self.apply_preprocessing)
+        self.threshold_slider.valueChanged.connect(self._schedule_preprocessing)
         preprocess_layout.addWidget(QLabel('Threshold:'))
         preprocess_layout.addWidget(self.threshold_slider)
         self.threshold_label = QLabel('127')
@@ -119,8 +161,8 @@ class SingleImageTab(QWidget):
         # Language selection
         ocr_layout.addWidget(QLabel('Language:'))
         self.language_combo = QComboBox()
-        for code, name in SUPPORTED_LANGUAGES.items():
-            self.language_combo.addItem(f"{name} ({code})", code)
+        for label, code in LANGUAGE_ITEMS:
+            self.language_combo.addItem(label, code)
         self.language_combo.setCurrentText("English (eng)")
         ocr_layout.addWidget(self.language_combo)
         
@@ -188,25 +230,56 @@ class SingleImageTab(QWidget):
         file_name, _ = QFileDialog.getOpenFileName(self, "Select Image", "", IMAGE_FILTER)
         
         if file_name:
-            self.original_image = cv2.imread(file_name)
-            if self.original_image is not None:
-                self.image = self.original_image.copy()
-                self.display_image(self.image)
-                self.ocr_btn.setEnabled(True)
-                self.roi_btn.setEnabled(True)
-                self.clear_roi()
-                logger.info(f"Loaded image: {file_name}")
+            # Decode on the thread pool; big scans take a while
+            self.load_btn.setEnabled(False)
+            self.image_label.setText("Loading image...")
+            job = OCRWorker(ImageUtils.load_image_reduced, file_name)
+            job.signals.finished.connect(lambda loaded: self._on_image_loaded(*loaded, file_name))
+            job.signals.failed.connect(lambda message: self._on_image_loaded(None, 1, file_name))
+            self._load_job = job
+            QThreadPool.globalInstance().start(job)
+    
+    def _on_image_loaded(self, image, factor, file_name):
+        """Show an image decoded by load_image_reduced."""
+        self._load_job = None
+        self.load_btn.setEnabled(self.camera is None)
+        
+        if image is not None:
+            self.original_image = image
+            self.image = self.original_image.copy()
+            self._load_factor = factor
+            self._base_pixmap = None
+            self._preprocess_key = None
+            self.display_current_image()
+            self.ocr_btn.setEnabled(True)
+            self.roi_btn.setEnabled(True)
+            self.clear_roi()
+            logger.info(f"Loaded image: {file_name}")
+        else:
+            if self.image is not None:
+                self.display_current_image()
             else:
-                logger.error(f"Failed to load image: {file_name}")
+                self.image_label.setText("Load an image or start camera")
+            logger.error(f"Failed to load image: {file_name}")
     
     def toggle_camera(self):
         """Toggle camera on/off."""
         if self.camera is None:
-            self.camera = cv2.VideoCapture(0)
+            self.camera = cv2.VideoCapture(0, CAMERA_BACKEND)
+            if not self.camera.isOpened() and CAMERA_BACKEND != cv2.CAP_ANY:
+                self.camera = cv2.VideoCapture(0)
             if self.camera.isOpened():
-                self.timer = QTimer()
+                # Compressed frames are cheaper to transfer and decode than
+                # raw YUYV on most USB webcams
+                self.camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+                # Keep only the newest frame queued, so a slow preview drops
+                # frames instead of falling behind (ignored by some backends)
+                self.camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                self._frame_time_ms = 0.0
+                self._frame_buf = None
+                self.timer = QTimer(self)
                 self.timer.timeout.connect(self.update_frame)
-                self.timer.start(30)
+                self.timer.start(CAMERA_MIN_INTERVAL)
                 self.camera_btn.setText('Stop Camera')
                 self.capture_btn.setEnabled(True)
                 self.load_btn.setEnabled(False)
@@ -215,20 +288,52 @@ class SingleImageTab(QWidget):
                 logger.error("Failed to open camera")
                 self.camera = None
         else:
-            self.timer.stop()
-            self.camera.release()
-            self.camera = None
-            self.camera_btn.setText('Start Camera')
-            self.capture_btn.setEnabled(False)
-            self.load_btn.setEnabled(True)
-            logger.info("Camera stopped")
+            self.stop_camera()
+    
+    def stop_camera(self):
+        """Stop the preview and release the capture device, if running."""
+        if self.camera is None:
+            return
+        self.timer.stop()
+        self.camera.release()
+        self.camera = None
+        self._frame_buf = None
+        self.camera_btn.setText('Start Camera')
+        self.capture_btn.setEnabled(False)
+        self.load_btn.setEnabled(True)
+        logger.info("Camera stopped")
+    
+    def closeEvent(self, event):
+        """Release the camera when the tab is closed."""
+        self.stop_camera()
+        super().closeEvent(event)
     
     def update_frame(self):
         """Update camera frame."""
         if self.camera is not None:
-            ret, frame = self.camera.read()
-            if ret:
-                self.display_image(frame)
+            # Nothing to show: drain the driver's queue without decoding
+            if not self.isVisible() or self.image_label.visibleRegion().isEmpty():
+                self.camera.grab()
+                return
+            # Decode into the previous frame's buffer; the pixmap made from it
+            # is a copy, so nothing else holds on to it
+            ret, frame = self.camera.read(self._frame_buf)
+            if not ret:
+                return
+            self._frame_buf = frame
+            
+            label_size = (self.image_label.width(), self.image_label.height())
+            start = time.perf_counter()
+            self.image_label.setPixmap(ImageUtils.create_scaled_pixmap(
+                frame, label_size, smooth=False))
+            
+            # Smoothed render cost; widen the interval if repaints can't keep up
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self._frame_time_ms = 0.8 * self._frame_time_ms + 0.2 * elapsed_ms
+            interval = int(min(CAMERA_MAX_INTERVAL,
+                               max(CAMERA_MIN_INTERVAL, self._frame_time_ms * 1.2)))
+            if interval != self.timer.interval():
+                self.timer.setInterval(interval)
     
     def capture_frame(self):
         """Capture current camera frame."""
@@ -237,10 +342,13 @@ class SingleImageTab(QWidget):
             if ret:
                 self.original_image = frame.copy()
                 self.image = frame.copy()
+                self._load_factor = 1
+                self._base_pixmap = None
+                self._preprocess_key = None
                 self.toggle_camera()
                 self.ocr_btn.setEnabled(True)
                 self.roi_btn.setEnabled(True)
-                self.display_image(self.image)
+                self.display_current_image()
                 logger.info("Frame captured")
     
     def enable_roi_selection(self):
@@ -257,7 +365,7 @@ class SingleImageTab(QWidget):
         self.roi_end = None
         self.selecting_roi = False
         if self.image is not None:
-            self.display_image(self.image)
+            self.display_current_image()
         self.clear_roi_btn.setEnabled(False)
         self.roi_changed.emit(None)
     
@@ -270,6 +378,15 @@ class SingleImageTab(QWidget):
         """Handle mouse move for ROI selection."""
         if self.selecting_roi and self.roi_start is not None:
             self.roi_end = (event.x(), event.y())
+            # Moves that arrive before the next event-loop turn share one redraw
+            if not self._roi_dirty:
+                self._roi_dirty = True
+                QTimer.singleShot(0, self._flush_roi)
+    
+    def _flush_roi(self):
+        """Redraw the ROI being dragged, once per event-loop turn."""
+        if self._roi_dirty:
+            self._roi_dirty = False
             self.display_image_with_roi()
     
     def mouse_release(self, event):
@@ -277,6 +394,7 @@ class SingleImageTab(QWidget):
         if self.selecting_roi and self.roi_start is not None:
             self.roi_end = (event.x(), event.y())
             self.selecting_roi = False
+            self._roi_dirty = False
             
             # Convert screen coordinates to image coordinates
             img_size = (self.image.shape[1], self.image.shape[0])
@@ -292,7 +410,7 @@ class SingleImageTab(QWidget):
                 self.roi_rect = (x1, y1, x2, y2)
                 self.clear_roi_btn.setEnabled(True)
                 self.display_image_with_roi()
-                self.roi_changed.emit(self.roi_rect)
+                self.roi_changed.emit(tuple(v * self._load_factor for v in self.roi_rect))
                 logger.info(f"ROI selected: {self.roi_rect}")
     
     def display_image_with_roi(self):
@@ -300,27 +418,56 @@ class SingleImageTab(QWidget):
         if self.image is None:
             return
         
-        display_img = self.image.copy()
-        
+        img_size = (self.image.shape[1], self.image.shape[0])
         if self.roi_start and self.roi_end:
-            # Draw temporary ROI rectangle
-            img_size = (display_img.shape[1], display_img.shape[0])
+            # Temporary ROI rectangle while dragging
             display_size = (self.image_label.width(), self.image_label.height())
-            
             start_img = ImageUtils.screen_to_image_coords(self.roi_start, img_size, display_size)
             end_img = ImageUtils.screen_to_image_coords(self.roi_end, img_size, display_size)
-            
-            cv2.rectangle(display_img, start_img, end_img, (0, 255, 0), 2)
         elif self.roi_rect:
             x1, y1, x2, y2 = self.roi_rect
-            cv2.rectangle(display_img, (x1, y1), (x2, y2), (0, 255, 0), 2)
+            start_img, end_img = (x1, y1), (x2, y2)
+        else:
+            self.display_current_image()
+            return
+        
+        # Draw on a copy of the cached scaled image, in its coordinates
+        pixmap = QPixmap(self._get_base_pixmap())
+        scale = pixmap.width() / img_size[0]
+        x1, y1 = int(start_img[0] * scale), int(start_img[1] * scale)
+        x2, y2 = int(end_img[0] * scale), int(end_img[1] * scale)
         
-        self.display_image(display_img)
+        painter = QPainter(pixmap)
+        painter.setPen(QPen(QColor(0, 255, 0), 2))
+        painter.drawRect(min(x1, x2), min(y1, y2), abs(x2 - x1), abs(y2 - y1))
+        painter.end()
+        
+        self.image_label.setPixmap(pixmap)
+    
+    def display_current_image(self):
+        """Display self.image, reusing its scaled pixmap when nothing changed."""
+        self.image_label.setPixmap(self._get_base_pixmap())
+    
+    def _get_base_pixmap(self):
+        """Get the scaled pixmap of self.image, rebuilding it if stale."""
+        key = (id(self.image), self.image.shape, self.image_label.width(), self.image_label.height())
+        if self._base_pixmap is None or self._base_pixmap_key != key:
+            self._base_pixmap = self._scaled_pixmap(self.image)
+            self._base_pixmap_key = key
+        return self._base_pixmap
+    
+    def _scaled_pixmap(self, img):
+        """Scale an image to the display label."""
+        return ImageUtils.create_scaled_pixmap(
+            img, (self.image_label.width(), self.image_label.height()))
     
     def display_image(self, img):
         """Display image in label."""
-        pixmap = ImageUtils.create_scaled_pixmap(img, self.image_label.size())
-        self.image_label.setPixmap(pixmap)
+        self.image_label.setPixmap(self._scaled_pixmap(img))
+    
+    def _schedule_preprocessing(self, _value=None):
+        """Restart the debounce timer; preprocessing runs once the slider rests."""
+        self._preprocess_timer.start()
     
     def apply_preprocessing(self):
         """Apply preprocessing to image."""
@@ -330,90 +477,156 @@ class SingleImageTab(QWidget):
         method = self.preprocess_combo.currentText()
         threshold_value = self.threshold_slider.value()
         
+        # Only Threshold depends on the slider; skip runs that can't change anything
+        key = (method, threshold_value if method == 'Threshold' else None)
+        if key == self._preprocess_key:
+            return
+        self._preprocess_key = key
+        
         if method.startswith("Plugin: "):
             # Handle plugin preprocessing
             plugin_name = method.replace("Plugin: ", "")
             plugin = plugin_manager.get_plugin(plugin_name)
             if plugin:
-                self.image = plugin.process(self.original_image.copy())
+                # OCR only needs luminance, so skip the plugins' conversion
+                # back to BGR. Plugins don't modify their input, so the
+                # original needs no defensive copy
+                self.image = plugin.process(self.original_image, return_gray=True)
             else:
                 self.image = self.original_image.copy()
         else:
-            # Handle built-in preprocessing
+            # Handle built-in preprocessing; built-in methods never modify
+            # their input, so the original needs no defensive copy
+            size = self.original_image.shape[:2]
+            if self._preprocess_buf is None or self._preprocess_buf.shape != size:
+                self._preprocess_buf = np.empty(size, dtype=np.uint8)
             self.image = ImageProcessor.apply_preprocessing(
-                self.original_image.copy(), method, threshold_value)
+                self.original_image, method, threshold_value, dst=self._preprocess_buf)
         
+        # The preprocessing buffer is rewritten in place, so the cached
+        # pixmap can't be recognized as stale from the array alone
+        self._base_pixmap = None
         if self.roi_rect:
             self.display_image_with_roi()
         else:
-            self.display_image(self.image)
+            self.display_current_image()
+    
+    def _start_ocr_job(self, fn, *args, on_finished, on_failed):
+        """Run a blocking OCR call on the thread pool, keeping the GUI responsive."""
+        # One job at a time; the buttons come back when it reports
+        self.ocr_btn.setEnabled(False)
+        self.overlay_btn.setEnabled(False)
+        
+        job = OCRWorker(fn, *args)
+        job.signals.finished.connect(on_finished)
+        job.signals.failed.connect(on_failed)
+        job.signals.finished.connect(self._ocr_job_done)
+        job.signals.failed.connect(self._ocr_job_done)
+        self._ocr_job = job
+        QThreadPool.globalInstance().start(job)
+    
+    def _ocr_job_done(self, _result=None):
+        """Re-enable the OCR controls once a background job has reported."""
+        self._ocr_job = None
+        self.ocr_btn.setEnabled(self.image is not None)
+        self.overlay_btn.setEnabled(self._overlay_ready)
+    
+    def _ocr_input(self):
+        """
+        Get a private copy of the image region to OCR and its offset.
+        
+        The worker thread must own its pixels: the displayed image may be
+        the reused preprocessing buffer, rewritten by the next slider move.
+        """
+        if self.roi_rect:
+            ocr_image = ImageProcessor.apply_roi(self.image, self.roi_rect)
+            offset = (self.roi_rect[0], self.roi_rect[1])
+        else:
+            ocr_image = self.image
+            offset = (0, 0)
+        return ocr_image.copy(), offset
     
     def run_ocr(self):
         """Run OCR on current image."""
-        if self.image is None:
+        if self.image is None or self._ocr_job is not None:
             return
         
-        try:
-            # Get the image to process
-            if self.roi_rect:
-                ocr_image = ImageProcessor.apply_roi(self.image, self.roi_rect)
-            else:
-                ocr_image = self.image
-            
-            # Get selected language
-            language = self.language_combo.currentData()
-            
-            # Run OCR
-            text = ImageProcessor.run_ocr(ocr_image, language)
-            self.text_output.setText(text)
-            self.overlay_btn.setEnabled(True)
-            self.edit_text_btn.setEnabled(True)
-            logger.info(f"OCR completed successfully with language: {language}")
-            
-        except Exception as e:
-            error_msg = f"Error: {str(e)}"
-            self.text_output.setText(error_msg)
-            logger.error(f"OCR failed: {e}")
+        # Get the image to process and the selected language
+        ocr_image, _ = self._ocr_input()
+        language = self.language_combo.currentData()
+        
+        self.text_output.setText("Running OCR...")
+        self._start_ocr_job(ImageProcessor.run_ocr, ocr_image, language,
+                            on_finished=lambda text: self._on_ocr_finished(text, language),
+                            on_failed=self._on_ocr_failed)
+    
+    def _on_ocr_finished(self, text, language):
+        """Show the text of a finished OCR job."""
+        self.text_output.setText(text)
+        self._overlay_ready = True
+        self.edit_text_btn.setEnabled(True)
+        logger.info(f"OCR completed successfully with language: {language}")
+    
+    def _on_ocr_failed(self, message):
+        """Report a failed OCR job."""
+        self.text_output.setText(f"Error: {message}")
+        logger.error(f"OCR failed: {message}")
     
     def show_overlay(self):
         """Show text overlay on image."""
-        if self.image is None:
+        if self.image is None or self._ocr_job is not None:
+            return
+        
+        # Get the image to process and the box filter settings
+        ocr_image, offset = self._ocr_input()
+        language = self.language_combo.currentData()
+        confidence_threshold = self.confidence_slider.value()
+        
+        self._start_ocr_job(ImageProcessor.get_text_boxes, ocr_image, confidence_threshold, language,
+                            on_finished=lambda data: self._draw_overlay(data, offset, confidence_threshold),
+                            on_failed=self._on_overlay_failed)
+    
+    def _draw_overlay(self, data, offset, confidence_threshold):
+        """Draw the word boxes of a finished overlay job over the original image."""
+        if self.original_image is None:
             return
         
         try:
-            # Get the image to process
-            if self.roi_rect:
-                ocr_image = ImageProcessor.apply_roi(self.image, self.roi_rect)
-                offset = (self.roi_rect[0], self.roi_rect[1])
-            else:
-                ocr_image = self.image.copy()
-                offset = (0, 0)
+            # Annotate the display-sized pixmap rather than a full-size copy
+            # of the original image
+            pixmap = self._scaled_pixmap(self.original_image)
+            scale = pixmap.width() / self.original_image.shape[1]
             
-            # Get bounding boxes
-            language = self.language_combo.currentData()
-            confidence_threshold = self.confidence_slider.value()
-            data = ImageProcessor.get_text_boxes(ocr_image, confidence_threshold, language)
+            # Filter the confident words in one vectorized pass
+            conf = np.asarray(data['conf'], dtype=np.float64).astype(np.int32)
+            keep = np.flatnonzero(conf > confidence_threshold)
+            if keep.size:
+                x = (np.asarray(data['left'], dtype=np.int32)[keep] + offset[0]) * scale
+                y = (np.asarray(data['top'], dtype=np.int32)[keep] + offset[1]) * scale
+                w = np.asarray(data['width'], dtype=np.int32)[keep] * scale
+                h = np.asarray(data['height'], dtype=np.int32)[keep] * scale
+                boxes = np.stack([x, y, w, h], axis=1).astype(np.int32).tolist()
+                
+                painter = QPainter(pixmap)
+                painter.setPen(QPen(QColor(0, 255, 0), 2))
+                painter.drawRects([QRect(*box) for box in boxes])
+                
+                painter.setPen(QColor(0, 0, 255))
+                texts = data['text']
+                for i, (bx, by, _, _) in zip(keep.tolist(), boxes):
+                    painter.drawText(bx, by - 3, texts[i])
+                painter.end()
             
-            # Draw on original image
-            overlay_img = self.original_image.copy()
-            
-            for i in range(len(data['text'])):
-                if int(data['conf'][i]) > confidence_threshold:
-                    x = data['left'][i] + offset[0]
-                    y = data['top'][i] + offset[1]
-                    w = data['width'][i]
-                    h = data['height'][i]
-                    
-                    cv2.rectangle(overlay_img, (x, y), (x + w, y + h), (0, 255, 0), 2)
-                    cv2.putText(overlay_img, data['text'][i], (x, y - 5),
-                              cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 1)
-            
-            self.display_image(overlay_img)
+            self.image_label.setPixmap(pixmap)
             logger.info("Text overlay displayed")
             
         except Exception as e:
-            self.text_output.append(f"\nOverlay Error: {str(e)}")
-            logger.error(f"Overlay failed: {e}")
+            self._on_overlay_failed(str(e))
+    
+    def _on_overlay_failed(self, message):
+        """Report a failed overlay job."""
+        self.text_output.append(f"\nOverlay Error: {message}")
+        logger.error(f"Overlay failed: {message}")
     
     def edit_text(self):
         """Open text editor for OCR result correction."""
@@ -3,6 +3,8 @@ Text editor dialog for OCR result correction.
 """
 
 import logging
+import re
+from collections import Counter
 from typing import Optional
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, 
                              QTextEdit, QLabel, QCheckBox, QSpinBox, QGroupBox,
@@ -12,6 +14,43 @@ from PyQt5.QtGui import QFont, QTextCursor
 
 logger = logging.getLogger(__name__)
 
+# Characters removed by "Remove noise characters" when one makes up more
+# than NOISE_CHAR_RATIO of the text
+NOISE_CHARS = "~`!@#$%^&*()_+-=[]{}|;':\",./<>?"
+NOISE_CHAR_RATIO = 0.1
+
+# Spacing fixes
+_MULTI_SPACE = re.compile(r'\s+')
+_SPACE_BEFORE_PUNCT = re.compile(r'\s+([,.!?;:])')
+_SPACE_AFTER_PUNCT = re.compile(r'([,.!?;:])\s*')
+
+# Punctuation fixes: " ," " ." " !" " ?" lose the space, ",," and ".." collapse
+_SPACE_BEFORE_MARK = re.compile(r' ([,.!?])')
+_DOUBLED_MARK = re.compile(r'([,.])\1')
+
+# Common OCR misrecognitions as (wrong, correct)
+COMMON_OCR_ERRORS = (
+    ("rn", "m"),
+    ("cl", "d"),
+    ("0", "O"),
+    ("1", "l"),
+    ("5", "S"),
+    ("8", "B"),
+    ("vv", "w"),
+    ("nn", "m"),
+    ("li", "h"),
+    (".", ","),
+    (" ,", ","),
+    (" .", "."),
+    ("  ", " "),  # Double spaces
+    ("\\n\\n\\n", "\\n\\n"),  # Triple newlines
+)
+
+
+def _capitalize_sentences(text: str) -> str:
+    """Capitalize each ". "-separated sentence (lower-casing the rest) and drop empty ones."""
+    return '. '.join([s.capitalize() for s in map(str.strip, text.split('. ')) if s])
+
 
 class TextEditorDialog(QDialog):
     """Dialog for editing and correcting OCR results."""
@@ -23,6 +62,7 @@ class TextEditorDialog(QDialog):
         self.original_text = original_text
         self.corrected_text = original_text
         self.suggestions = []
+        self._suggestions_text = None
         
         self.init_ui()
         self.load_text()
@@ -207,28 +247,16 @@ class TextEditorDialog(QDialog):
         
     def generate_suggestions(self):
         """Generate common OCR error corrections."""
+        # The list already matches this text
+        if self.corrected_text == self._suggestions_text:
+            return
+        self._suggestions_text = self.corrected_text
         self.suggestions_list.clear()
         
-        # Common OCR misrecognitions
-        common_errors = [
-            ("rn", "m"),
-            ("cl", "d"),
-            ("0", "O"),
-            ("1", "l"),
-            ("5", "S"),
-            ("8", "B"),
-            ("vv", "w"),
-            ("nn", "m"),
-            ("li", "h"),
-            (".", ","),
-            (" ,", ","),
-            (" .", "."),
-            ("  ", " "),  # Double spaces
-            ("\\n\\n\\n", "\\n\\n"),  # Triple newlines
-        ]
-        
-        text = self.corrected_text.lower()
-        for wrong, correct in common_errors:
+        text = self.corrected_text
+        if not text.islower():
+            text = text.lower()
+        for wrong, correct in COMMON_OCR_ERRORS:
             if wrong in text:
                 item = QListWidgetItem(f"Replace '{wrong}' with '{correct}'")
                 item.setData(Qt.UserRole, (wrong, correct))
@@ -245,34 +273,29 @@ class TextEditorDialog(QDialog):
         """Apply automatic corrections based on selected options."""
         text = self.text_edit.toPlainText()
         
-        if self.remove_noise_cb.isChecked():
-            # Remove common OCR noise characters
-            noise_chars = "~`!@#$%^&*()_+-=[]{}|;':\",./<>?"
-            for char in noise_chars:
-                if text.count(char) / len(text) > 0.1:  # If more than 10% of text
-                    text = text.replace(char, "")
+        if self.remove_noise_cb.isChecked() and text:
+            # Remove common OCR noise characters: one histogram pass, then
+            # one translate pass deleting every over-represented character
+            counts = Counter(text)
+            limit = NOISE_CHAR_RATIO * len(text)
+            noise = [char for char in NOISE_CHARS if counts[char] > limit]
+            if noise:
+                text = text.translate(dict.fromkeys(map(ord, noise)))
                     
         if self.fix_spacing_cb.isChecked():
             # Fix spacing issues
-            import re
-            text = re.sub(r'\s+', ' ', text)  # Multiple spaces to single
-            text = re.sub(r'\s+([,.!?;:])', r'\1', text)  # Space before punctuation
-            text = re.sub(r'([,.!?;:])\s*', r'\1 ', text)  # Space after punctuation
+            text = _MULTI_SPACE.sub(' ', text)  # Multiple spaces to single
+            text = _SPACE_BEFORE_PUNCT.sub(r'\1', text)  # Space before punctuation
+            text = _SPACE_AFTER_PUNCT.sub(r'\1 ', text)  # Space after punctuation
             
         if self.fix_punctuation_cb.isChecked():
             # Fix common punctuation errors
-            text = text.replace(' ,', ',')
-            text = text.replace(' .', '.')
-            text = text.replace(' !', '!')
-            text = text.replace(' ?', '?')
-            text = text.replace(',,', ',')
-            text = text.replace('..', '.')
+            text = _SPACE_BEFORE_MARK.sub(r'\1', text)
+            text = _DOUBLED_MARK.sub(r'\1', text)
             
         if self.fix_capitalization_cb.isChecked():
             # Fix capitalization
-            sentences = text.split('. ')
-            sentences = [s.strip().capitalize() for s in sentences if s.strip()]
-            text = '. '.join(sentences)
+            text = _capitalize_sentences(text)
             
         self.text_edit.setPlainText(text)
         
@@ -27,6 +27,10 @@ def main():
         scanner = OCRScanner()
         scanner.show()
         
+        # Child widgets get no closeEvent when the window closes, so free
+        # the capture device explicitly on the way out
+        app.aboutToQuit.connect(scanner.single_tab.stop_camera)
+        
         logger.info("OCR Scanner application started successfully")
         
         # Run application
@@ -3,25 +3,78 @@ Base plugin class for custom preprocessing.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+import cv2
 import numpy as np
 
 
+# Values of the plugins' "accelerate" parameter
+ACCELERATORS = ("auto", "cpu", "opencl", "cuda")
+
+
+def cuda_available() -> bool:
+    """Whether OpenCV was built with CUDA and sees a device."""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
+
+
+def resolve_accelerator(accelerate: str, cuda: bool) -> str:
+    """
+    Pick the backend an accelerated plugin runs on.
+    
+    Args:
+        accelerate: Requested backend, one of ACCELERATORS
+        cuda: Whether a CUDA device is available
+        
+    Returns:
+        "cuda", "opencl" or "cpu"; a requested backend that is not
+        available falls back to the CPU
+    """
+    if accelerate not in ACCELERATORS:
+        raise ValueError(f"Unknown accelerator: {accelerate}")
+    if accelerate == "auto":
+        if cuda:
+            return "cuda"
+        # OpenCL through the transparent API (UMat), as the built-in
+        # preprocessing does
+        return "opencl" if cv2.ocl.useOpenCL() else "cpu"
+    if accelerate == "cuda" and not cuda:
+        return "cpu"
+    if accelerate == "opencl" and not cv2.ocl.haveOpenCL():
+        return "cpu"
+    return accelerate
+
+
 class BasePreprocessingPlugin(ABC):
-    """Base class for preprocessing plugins."""
+    """
+    Base class for preprocessing plugins.
+    
+    Metadata declared as class attributes can be listed without
+    instantiating the plugin; values assigned in __init__ still work.
+    """
+    
+    name: Optional[str] = None  # Defaults to the class name
+    description = "Custom preprocessing plugin"
+    version = "1.0.0"
+    author = "Unknown"
     
     def __init__(self):
-        self.name = self.__class__.__name__
-        self.description = "Custom preprocessing plugin"
-        self.version = "1.0.0"
-        self.author = "Unknown"
+        if self.name is None:
+            self.name = self.__class__.__name__
         self.parameters = {}
+        # Grayscale conversion buffer reused across same-sized images
+        self._gray_buf: Optional[np.ndarray] = None
         
     @abstractmethod
     def process(self, image: np.ndarray, **kwargs) -> np.ndarray:
         """
         Process the input image.
         
+        The input belongs to the caller and must not be modified; the
+        result must be a new array, never the input itself.
+        
         Args:
             image: Input image as numpy array
             **kwargs: Additional parameters
@@ -41,6 +94,24 @@ class BasePreprocessingPlugin(ABC):
         """
         pass
     
+    def process_batch(self, images: List[np.ndarray], **kwargs) -> List[np.ndarray]:
+        """
+        Process several images with the same parameters.
+        
+        The default runs process() on each image in turn on this thread, so
+        the state a plugin caches between calls (OpenCV objects, scratch
+        buffers) is set up once for the whole batch. Plugins that can do
+        better on a whole batch may override it.
+        
+        Args:
+            images: Input images
+            **kwargs: Additional parameters, passed to every process() call
+            
+        Returns:
+            Processed images, in input order
+        """
+        return [self.process(image, **kwargs) for image in images]
+    
     def set_parameters(self, parameters: Dict[str, Any]) -> None:
         """
         Set plugin parameters.
@@ -64,6 +135,42 @@ class BasePreprocessingPlugin(ABC):
             "author": self.author
         }
     
+    def to_gray(self, image: np.ndarray) -> np.ndarray:
+        """
+        Get a grayscale version of an image.
+        
+        BGR input is converted into a buffer owned by the plugin, which the
+        next call overwrites; grayscale input is returned as is. Either way
+        the result must not be modified or returned to the caller.
+        
+        Args:
+            image: Input image (BGR or grayscale)
+            
+        Returns:
+            Grayscale image
+        """
+        if len(image.shape) == 2:
+            return image
+        size = image.shape[:2]
+        if self._gray_buf is None or self._gray_buf.shape != size:
+            self._gray_buf = np.empty(size, dtype=np.uint8)
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=self._gray_buf)
+    
+    @classmethod
+    def get_class_info(cls) -> Dict[str, str]:
+        """
+        Get plugin information declared on the class.
+        
+        Returns:
+            Dictionary with plugin metadata
+        """
+        return {
+            "name": cls.name or cls.__name__,
+            "description": cls.description,
+            "version": cls.version,
+            "author": cls.author
+        }
+    
     def validate_image(self, image: np.ndarray) -> bool:
         """
         Validate input image.
@@ -74,10 +181,5 @@ class BasePreprocessingPlugin(ABC):
         Returns:
             True if image is valid
         """
-        if image is None:
-            return False
-        if not isinstance(image, np.ndarray):
-            return False
-        if len(image.shape) not in [2, 3]:
-            return False
-        return True
\ No newline at end of file
+        # isinstance() also rejects None
+        return isinstance(image, np.ndarray) and image.ndim in (2, 3)
\ No newline at end of file
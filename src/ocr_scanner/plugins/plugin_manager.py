@@ -4,15 +4,31 @@ Plugin manager for loading and managing preprocessing plugins.
 
 import os
 import sys
+import functools
 import importlib.util
 import logging
-from typing import Dict, List, Type, Optional
+from typing import Callable, Dict, List, Tuple, Type, Optional
 from pathlib import Path
 
+import numpy as np
+
 from .base_plugin import BasePreprocessingPlugin
 
 logger = logging.getLogger(__name__)
 
+def _declares_class_info(plugin_class: Type[BasePreprocessingPlugin]) -> bool:
+    """Whether a plugin class declares its metadata as class attributes."""
+    return any("description" in vars(cls) for cls in plugin_class.__mro__
+               if cls is not BasePreprocessingPlugin)
+
+
+def _mtime(file_path: Path) -> Optional[float]:
+    """Modification time of a file, or None if it can't be read."""
+    try:
+        return file_path.stat().st_mtime
+    except OSError:
+        return None
+
 
 class PluginManager:
     """Manages preprocessing plugins."""
@@ -20,6 +36,9 @@ class PluginManager:
     def __init__(self):
         self.plugins: Dict[str, Type[BasePreprocessingPlugin]] = {}
         self.plugin_instances: Dict[str, BasePreprocessingPlugin] = {}
+        self._info_cache: Dict[str, Dict[str, str]] = {}
+        # Plugin file -> (mtime, plugin classes) of its last successful load
+        self._loaded: Dict[Path, Tuple[float, List[Type[BasePreprocessingPlugin]]]] = {}
         self.plugin_directories = []
         
         # Add default plugin directories
@@ -44,11 +63,28 @@ class PluginManager:
     
     def load_plugins(self) -> None:
         """Load all plugins from registered directories."""
+        # Plugins are arbitrary third-party code, so they run one at a time;
+        # files unchanged since their last load are not executed again
         for directory in self.plugin_directories:
             self._load_plugins_from_directory(directory)
             
         logger.info(f"Loaded {len(self.plugins)} plugins")
     
+    def _plugin_files(self, directory: Path) -> List[Path]:
+        """
+        List the plugin files in a directory.
+        
+        Args:
+            directory: Directory to search for plugins
+            
+        Returns:
+            Paths of the candidate plugin modules
+        """
+        if not directory.exists():
+            return []
+        return [file_path for file_path in directory.glob("*.py")
+                if not file_path.name.startswith("__")]
+    
     def _load_plugins_from_directory(self, directory: Path) -> None:
         """
         Load plugins from a specific directory.
@@ -56,17 +92,8 @@ class PluginManager:
         Args:
             directory: Directory to search for plugins
         """
-        if not directory.exists():
-            return
-            
-        for file_path in directory.glob("*.py"):
-            if file_path.name.startswith("__"):
-                continue
-                
-            try:
-                self._load_plugin_from_file(file_path)
-            except Exception as e:
-                logger.error(f"Failed to load plugin {file_path}: {e}")
+        for file_path in self._plugin_files(directory):
+            self._load_plugin_from_file(file_path)
     
     def _load_plugin_from_file(self, file_path: Path) -> None:
         """
@@ -75,27 +102,72 @@ class PluginManager:
         Args:
             file_path: Path to plugin file
         """
-        module_name = file_path.stem
-        spec = importlib.util.spec_from_file_location(module_name, file_path)
+        mtime = _mtime(file_path)
+        if not self._is_current(file_path, mtime):
+            self._remember(file_path, mtime, self._find_plugin_classes(file_path))
+        if file_path in self._loaded:
+            self._register_plugins(self._loaded[file_path][1])
+    
+    def _is_current(self, file_path: Path, mtime: Optional[float]) -> bool:
+        """Whether a plugin file was loaded and has not changed since."""
+        entry = self._loaded.get(file_path)
+        return mtime is not None and entry is not None and entry[0] == mtime
+    
+    def _remember(self, file_path: Path, mtime: Optional[float],
+                  plugin_classes: Optional[List[Type[BasePreprocessingPlugin]]]) -> None:
+        """Record the outcome of executing a plugin file."""
+        if plugin_classes is None or mtime is None:
+            # Failed loads are retried on the next load
+            self._loaded.pop(file_path, None)
+        else:
+            self._loaded[file_path] = (mtime, plugin_classes)
+    
+    def _find_plugin_classes(self, file_path: Path) -> Optional[List[Type[BasePreprocessingPlugin]]]:
+        """
+        Execute a plugin file and collect the plugin classes it defines.
         
-        if spec is None or spec.loader is None:
-            logger.warning(f"Could not load spec for {file_path}")
-            return
+        Args:
+            file_path: Path to plugin file
             
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
+        Returns:
+            Plugin classes found in the module, or None if it failed to load
+        """
+        module_name = file_path.stem
+        try:
+            spec = importlib.util.spec_from_file_location(module_name, file_path)
+            
+            if spec is None or spec.loader is None:
+                logger.warning(f"Could not load spec for {file_path}")
+                return None
+                
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        except Exception as e:
+            logger.error(f"Failed to load plugin {file_path}: {e}")
+            return None
         
         # Find plugin classes in the module
+        plugin_classes = []
         for attr_name in dir(module):
             attr = getattr(module, attr_name)
             
             if (isinstance(attr, type) and 
                 issubclass(attr, BasePreprocessingPlugin) and 
                 attr != BasePreprocessingPlugin):
-                
-                plugin_name = attr.__name__
-                self.plugins[plugin_name] = attr
-                logger.info(f"Loaded plugin: {plugin_name}")
+                plugin_classes.append(attr)
+        return plugin_classes
+    
+    def _register_plugins(self, plugin_classes: List[Type[BasePreprocessingPlugin]]) -> None:
+        """
+        Register loaded plugin classes under their class names.
+        
+        Args:
+            plugin_classes: Plugin classes to register
+        """
+        for plugin_class in plugin_classes:
+            plugin_name = plugin_class.__name__
+            self.plugins[plugin_name] = plugin_class
+            logger.info(f"Loaded plugin: {plugin_name}")
     
     def get_plugin(self, plugin_name: str) -> Optional[BasePreprocessingPlugin]:
         """
@@ -119,6 +191,28 @@ class PluginManager:
                 
         return self.plugin_instances[plugin_name]
     
+    def get_process_callable(self, plugin_name: str,
+                             **kwargs) -> Optional[Callable[[np.ndarray], np.ndarray]]:
+        """
+        Get a plugin's process method bound to fixed parameters.
+        
+        Loops over many images can call the result directly instead of
+        looking the plugin and its method up, and rebuilding the keyword
+        arguments, for every image.
+        
+        Args:
+            plugin_name: Name of the plugin
+            **kwargs: Parameters passed to every process() call
+            
+        Returns:
+            Callable taking an image and returning the processed image, or
+            None if the plugin is not available
+        """
+        plugin = self.get_plugin(plugin_name)
+        if plugin is None:
+            return None
+        return functools.partial(plugin.process, **kwargs)
+    
     def get_available_plugins(self) -> List[str]:
         """
         Get list of available plugin names.
@@ -138,15 +232,32 @@ class PluginManager:
         Returns:
             Plugin information dictionary or None
         """
-        plugin = self.get_plugin(plugin_name)
-        if plugin:
-            return plugin.get_info()
-        return None
+        info = self._info_cache.get(plugin_name)
+        if info is not None:
+            return info
+        
+        plugin_class = self.plugins.get(plugin_name)
+        if plugin_class is None:
+            return None
+        if plugin_name in self.plugin_instances:
+            info = self.plugin_instances[plugin_name].get_info()
+        elif _declares_class_info(plugin_class):
+            # Read the metadata off the class instead of instantiating
+            info = plugin_class.get_class_info()
+        else:
+            plugin = self.get_plugin(plugin_name)
+            if plugin is None:
+                return None
+            info = plugin.get_info()
+        
+        self._info_cache[plugin_name] = info
+        return info
     
     def reload_plugins(self) -> None:
-        """Reload all plugins."""
+        """Reload all plugins, re-executing only files changed since their last load."""
         self.plugins.clear()
         self.plugin_instances.clear()
+        self._info_cache.clear()
         self.load_plugins()
 
 
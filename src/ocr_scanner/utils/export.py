@@ -7,29 +7,58 @@ import json
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any
+from operator import itemgetter
+from typing import Iterable, Dict, Any, Optional, Sized, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional C encoder, stdlib json is the fallback
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Flattens OCR text onto a single CSV line in one C-level pass
+_NEWLINE_TRANS = str.maketrans({'\n': ' ', '\r': ' '})
+
+_WRITE_BUFFER_SIZE = 1 << 20
+
+_CSV_FIELDS = itemgetter('filename', 'status', 'timestamp', 'text')
+
+
+def _dumps(obj: Any) -> bytes:
+    """Encode one value as compact UTF-8 JSON (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
 
 class ResultExporter:
     """Handles exporting of batch processing results."""
     
     @staticmethod
-    def export_to_txt(results: List[Dict[str, Any]], file_path: str) -> None:
+    def export_to_txt(results: Iterable[Dict[str, Any]], file_path: str,
+                      total: Optional[int] = None) -> None:
         """
         Export results to text file.
         
         Args:
-            results: List of result dictionaries
+            results: Result dictionaries
             file_path: Output file path
+            total: Number of results, for the header. Without it a
+                non-sized iterable is materialized first to count it
         """
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
+            if total is None:
+                if not isinstance(results, Sized):
+                    results = list(results)
+                total = len(results)
+            
+            with open(file_path, 'w', encoding='utf-8',
+                      buffering=_WRITE_BUFFER_SIZE) as f:
                 f.write("OCR Batch Processing Results\n")
                 f.write("=" * 50 + "\n")
                 f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"Total files processed: {len(results)}\n\n")
+                f.write(f"Total files processed: {total}\n\n")
                 
                 for i, result in enumerate(results, 1):
                     f.write(f"File {i}: {result['filename']}\n")
@@ -47,57 +76,97 @@ class ResultExporter:
             raise
     
     @staticmethod
-    def export_to_csv(results: List[Dict[str, Any]], file_path: str) -> None:
+    def export_to_csv(results: Iterable[Dict[str, Any]], file_path: str) -> None:
         """
         Export results to CSV file.
         
+        Rows are written as they are produced, so ``results`` may be a
+        generator and is never held in memory as a whole.
+        
         Args:
-            results: List of result dictionaries
+            results: Result dictionaries
             file_path: Output file path
         """
+        # One C-level itemgetter call per record instead of four lookups
+        rows = map(_CSV_FIELDS, results)
+        ResultExporter._write_csv(
+            ((filename, status, timestamp, text.translate(_NEWLINE_TRANS))
+             for filename, status, timestamp, text in rows),
+            file_path)
+    
+    @staticmethod
+    def export_to_csv_columns(filenames: Iterable[str], statuses: Iterable[str],
+                              timestamps: Iterable[str], texts: Iterable[str],
+                              file_path: str) -> None:
+        """
+        Export results held as one sequence per column to CSV file.
+        
+        Args:
+            filenames: File name of each result
+            statuses: Status of each result
+            timestamps: Processing time of each result
+            texts: Extracted text of each result
+            file_path: Output file path
+        """
+        ResultExporter._write_csv(
+            zip(filenames, statuses, timestamps,
+                (text.translate(_NEWLINE_TRANS) for text in texts)),
+            file_path)
+    
+    @staticmethod
+    def _write_csv(rows: Iterable[Tuple[str, str, str, str]], file_path: str) -> None:
+        """Write the CSV header and rows in one writerows call."""
         try:
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
+            with open(file_path, 'w', newline='', encoding='utf-8',
+                      buffering=_WRITE_BUFFER_SIZE) as f:
                 writer = csv.writer(f)
                 writer.writerow(['Filename', 'Status', 'Timestamp', 'Extracted Text'])
-                
-                for result in results:
-                    writer.writerow([
-                        result['filename'],
-                        result['status'], 
-                        result['timestamp'],
-                        result['text'].replace('\n', ' ').replace('\r', ' ')
-                    ])
+                writer.writerows(rows)
             
             logger.info(f"Results exported to CSV: {file_path}")
-            
+        
         except Exception as e:
             logger.error(f"Failed to export to CSV: {e}")
             raise
     
     @staticmethod
-    def export_to_json(results: List[Dict[str, Any]], file_path: str) -> None:
+    def export_to_json(results: Iterable[Dict[str, Any]], file_path: str,
+                       total: Optional[int] = None) -> None:
         """
         Export results to JSON file.
         
+        Records are encoded and written one at a time, one per line, so peak
+        memory is a single record rather than the whole document.
+        
         Args:
-            results: List of result dictionaries
+            results: Result dictionaries
             file_path: Output file path
+            total: Number of results, for the metadata. Without it a
+                non-sized iterable is materialized first to count it
         """
         try:
-            export_data = {
-                "metadata": {
-                    "generated": datetime.now().isoformat(),
-                    "total_files": len(results),
-                    "version": "1.1.0"
-                },
-                "results": results
+            if total is None:
+                if not isinstance(results, Sized):
+                    results = list(results)
+                total = len(results)
+            
+            metadata = {
+                "generated": datetime.now().isoformat(),
+                "total_files": total,
+                "version": "1.1.0"
             }
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
+            with open(file_path, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+                f.write(b'{"metadata": ' + _dumps(metadata) + b',\n"results": [')
+                separator = b'\n'
+                for result in results:
+                    f.write(separator)
+                    f.write(_dumps(result))
+                    separator = b',\n'
+                f.write(b'\n]}\n')
             
             logger.info(f"Results exported to JSON: {file_path}")
             
         except Exception as e:
             logger.error(f"Failed to export to JSON: {e}")
-            raise
\ No newline at end of file
+            raise
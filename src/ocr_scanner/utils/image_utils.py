@@ -3,18 +3,118 @@ Image utility functions for OCR Scanner.
 """
 
 import logging
-from typing import Tuple
+from typing import Optional, Tuple
 import cv2
 import numpy as np
+from PIL import Image
 from PyQt5.QtGui import QImage, QPixmap
-from PyQt5.QtCore import Qt
+from PyQt5 import sip
+from PyQt5.QtCore import Qt, QSize
+
+from ..config.settings import MAX_LOAD_SIDE, MIN_REDUCED_SIDE
 
 logger = logging.getLogger(__name__)
 
+# QImage::Format_BGR888 needs Qt 5.14
+_HAS_BGR888 = hasattr(QImage, 'Format_BGR888')
+
+
+# Decoder-side downscale factors, largest first
+_REDUCED_READ_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+
+# Formats every OpenCV build decodes, recognized by their leading bytes
+_HEADER_SIZE = 16
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+_PNG_TRAILER = b'IEND\xaeB`\x82'
+_JPEG_SIGNATURE = b'\xff\xd8\xff'
+_JPEG_TRAILER = b'\xff\xd9'
+_TIFF_SIGNATURES = {b'II*\x00': 'little', b'MM\x00*': 'big'}
+
+
+def _looks_complete(f, header: bytes, file_size: int) -> bool:
+    """
+    Cheap sanity check of an image file against its own header.
+    
+    True only for a known format (PNG, JPEG, TIFF, BMP, WebP) whose size
+    or trailer is consistent with the header; False for anything else,
+    including formats this doesn't know.
+    """
+    if header.startswith(_PNG_SIGNATURE):
+        f.seek(-len(_PNG_TRAILER), 2)
+        return f.read() == _PNG_TRAILER
+    if header.startswith(_JPEG_SIGNATURE):
+        f.seek(-len(_JPEG_TRAILER), 2)
+        return f.read() == _JPEG_TRAILER
+    if header[:4] in _TIFF_SIGNATURES:
+        # The first directory must lie inside the file
+        first_ifd = int.from_bytes(header[4:8], _TIFF_SIGNATURES[header[:4]])
+        return 8 <= first_ifd < file_size
+    if header[:2] == b'BM':
+        return int.from_bytes(header[2:6], 'little') <= file_size
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return int.from_bytes(header[4:8], 'little') + 8 <= file_size
+    return False
+
+
+def _rows_are_packed(img: np.ndarray) -> bool:
+    """Whether each row of an 8-bit image is contiguous, whatever the row stride."""
+    if img.dtype != np.uint8:
+        return False
+    if img.ndim == 2:
+        return img.strides[1] == 1
+    return img.strides[2] == 1 and img.strides[1] == img.shape[2]
+
 
 class ImageUtils:
     """Utility functions for image handling and display."""
     
+    @staticmethod
+    def load_image(file_path: str) -> Optional[np.ndarray]:
+        """
+        Load an image, decoding oversized photos at reduced resolution.
+        
+        Args:
+            file_path: Path to image file
+            
+        Returns:
+            BGR image, or None if it could not be read
+        """
+        return ImageUtils.load_image_reduced(file_path)[0]
+    
+    @staticmethod
+    def load_image_reduced(file_path: str) -> Tuple[Optional[np.ndarray], int]:
+        """
+        Load an image, decoding oversized photos at reduced resolution.
+        
+        JPEG and WebP decoders can downscale by 2/4/8 while decoding, which is
+        much cheaper than decoding at full size and resizing afterwards.
+        
+        Args:
+            file_path: Path to image file
+            
+        Returns:
+            Tuple of (BGR image or None, factor the image was reduced by)
+        """
+        try:
+            # Only the header is parsed here
+            with Image.open(file_path) as probe:
+                long_side = max(probe.size)
+        except Exception:
+            long_side = 0
+        
+        if long_side > MAX_LOAD_SIDE:
+            for factor, flag in _REDUCED_READ_FLAGS:
+                if long_side // factor >= MIN_REDUCED_SIDE:
+                    logger.debug(f"Decoding {file_path} at 1/{factor} resolution")
+                    return cv2.imread(file_path, flag), factor
+        
+        return cv2.imread(file_path), 1
+    
     @staticmethod
     def cv2_to_qimage(cv_img: np.ndarray) -> QImage:
         """
@@ -26,33 +126,58 @@ class ImageUtils:
         Returns:
             QImage object
         """
+        # The QImage wraps the array's memory. Row-sliced views (ROI crops)
+        # are wrapped as they are, using the row stride; anything else is
+        # copied, and the QImage then detached from the temporary copy
+        shared = _rows_are_packed(cv_img)
+        if not shared:
+            cv_img = np.ascontiguousarray(cv_img)
+        height, width = cv_img.shape[:2]
+        bytes_per_line = cv_img.strides[0]
+        
         if len(cv_img.shape) == 2:
             # Grayscale image
-            height, width = cv_img.shape
-            bytes_per_line = width
-            return QImage(cv_img.data, width, height, bytes_per_line, QImage.Format_Grayscale8)
+            q_img = QImage(sip.voidptr(cv_img.ctypes.data), width, height, bytes_per_line, QImage.Format_Grayscale8)
+        elif _HAS_BGR888:
+            # Qt reads OpenCV's byte order directly, no channel swap
+            q_img = QImage(sip.voidptr(cv_img.ctypes.data), width, height, bytes_per_line, QImage.Format_BGR888)
         else:
-            # Color image
-            height, width, channel = cv_img.shape
-            bytes_per_line = 3 * width
-            rgb_image = cv2.cvtColor(cv_img, cv2.COLOR_BGR2RGB)
-            return QImage(rgb_image.data, width, height, bytes_per_line, QImage.Format_RGB888)
+            # rgbSwapped() returns a new image that owns its pixels
+            return QImage(sip.voidptr(cv_img.ctypes.data), width, height, bytes_per_line,
+                          QImage.Format_RGB888).rgbSwapped()
+        return q_img if shared else q_img.copy()
     
     @staticmethod
-    def create_scaled_pixmap(cv_img: np.ndarray, target_size: Tuple[int, int]) -> QPixmap:
+    def create_scaled_pixmap(cv_img: np.ndarray, target_size: Tuple[int, int],
+                             smooth: bool = True) -> QPixmap:
         """
         Create scaled pixmap from OpenCV image.
         
+        The image is scaled before it becomes a pixmap, so only the
+        display-sized result is converted. Reductions by half or more are
+        done with OpenCV's area interpolation rather than Qt's smooth scaling.
+        
         Args:
             cv_img: OpenCV image
             target_size: Target size (width, height)
+            smooth: Filter when scaling; live previews can pass False
             
         Returns:
             Scaled QPixmap
         """
+        height, width = cv_img.shape[:2]
+        size = QSize(width, height).scaled(target_size[0], target_size[1], Qt.KeepAspectRatio)
+        if smooth and not size.isEmpty() and size.width() * 2 <= width:
+            # Large reductions: area-average straight to the display size in
+            # OpenCV, so Qt only wraps the small result
+            small = cv2.resize(cv_img, (size.width(), size.height()),
+                               interpolation=cv2.INTER_AREA)
+            return QPixmap.fromImage(ImageUtils.cv2_to_qimage(small))
+        
         q_img = ImageUtils.cv2_to_qimage(cv_img)
-        pixmap = QPixmap.fromImage(q_img)
-        return pixmap.scaled(target_size[0], target_size[1], Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        mode = Qt.SmoothTransformation if smooth else Qt.FastTransformation
+        scaled = q_img.scaled(target_size[0], target_size[1], Qt.KeepAspectRatio, mode)
+        return QPixmap.fromImage(scaled)
     
     @staticmethod
     def calculate_display_scale(img_size: Tuple[int, int], display_size: Tuple[int, int]) -> float:
@@ -112,9 +237,16 @@ class ImageUtils:
         Returns:
             True if valid image file
         """
+        # A known format whose header, size and trailer agree is accepted
+        # without decoding; anything else (other formats, truncated or
+        # padded files) has to decode
         try:
-            img = cv2.imread(file_path)
-            return img is not None
+            with open(file_path, 'rb') as f:
+                header = f.read(_HEADER_SIZE)
+                file_size = f.seek(0, 2)
+                if len(header) == _HEADER_SIZE and _looks_complete(f, header, file_size):
+                    return True
+            return cv2.imread(file_path) is not None
         except Exception as e:
             logger.warning(f"Invalid image file {file_path}: {e}")
-            return False
\ No newline at end of file
+            return False
@@ -5,11 +5,31 @@ Tests for batch processor functionality.
 import pytest
 import tempfile
 import os
-from unittest.mock import Mock, patch
+from concurrent.futures import Future
+from unittest.mock import MagicMock, Mock, patch
 import numpy as np
 import cv2
 
-from ocr_scanner.core.batch_processor import BatchProcessor
+from ocr_scanner.core.batch_processor import (BatchProcessor, _get_tess_api, _process_one,
+                                              _process_chunk)
+from ocr_scanner.config.settings import DEFAULT_OCR_CONFIG
+from ocr_scanner.core.ocr_cache import OCRCache
+
+
+@pytest.fixture(scope="module")
+def color_image():
+    """Uniform BGR test image, shared read-only by the module's tests."""
+    image = np.full((100, 100, 3), 128, dtype=np.uint8)
+    image.setflags(write=False)
+    return image
+
+
+@pytest.fixture(scope="module")
+def gray_image():
+    """Uniform light grayscale test image, shared read-only by the module's tests."""
+    image = np.full((100, 100), 200, dtype=np.uint8)
+    image.setflags(write=False)
+    return image
 
 
 class TestBatchProcessor:
@@ -20,7 +40,7 @@ class TestBatchProcessor:
         self.temp_dir = tempfile.mkdtemp()
         
         # Create a simple test image
-        test_image = np.ones((100, 100, 3), dtype=np.uint8) * 255
+        test_image = np.full((100, 100, 3), 255, dtype=np.uint8)
         self.test_image_path = os.path.join(self.temp_dir, "test_image.png")
         cv2.imwrite(self.test_image_path, test_image)
         
@@ -52,6 +72,7 @@ class TestBatchProcessor:
         # Mock the signals
         processor.progress_updated = Mock()
         processor.file_processed = Mock()
+        processor.batch_processed = Mock()
         processor.finished_processing = Mock()
         
         processor.run()
@@ -59,42 +80,201 @@ class TestBatchProcessor:
         # Verify signals were emitted
         processor.progress_updated.emit.assert_called()
         processor.file_processed.emit.assert_called()
+        processor.batch_processed.emit.assert_called_once()
         processor.finished_processing.emit.assert_called()
     
-    def test_apply_preprocessing_none(self):
+    @patch('ocr_scanner.core.batch_processor.ProcessPoolExecutor')
+    def test_run_answers_from_cache(self, mock_pool):
+        """Test that cached files are not sent to the worker pool."""
+        cache_path = os.path.join(self.temp_dir, "cache.db")
+        cache = OCRCache(cache_path)
+        key = cache.make_key(self.test_image_path, "None", 127, None, "eng")
+        cache.put_many([(key, "Cached text")])
+        cache.close()
+        
+        processor = BatchProcessor([self.test_image_path], "None", 127, cache_path=cache_path)
+        processor.file_processed = Mock()
+        processor.batch_processed = Mock()
+        processor.progress_updated = Mock()
+        processor.finished_processing = Mock()
+        
+        processor.run()
+        
+        mock_pool.assert_not_called()
+        processor.file_processed.emit.assert_called_once_with(
+            "test_image.png", "Cached text", "Success")
+        processor.progress_updated.emit.assert_called_with(100)
+    
+    @patch('ocr_scanner.core.batch_processor.os.cpu_count', return_value=1)
+    @patch('ocr_scanner.core.batch_processor.ProcessPoolExecutor')
+    def test_run_hashes_per_chunk(self, mock_pool, mock_cpus):
+        """Test that OCR of the first chunk starts before later files are hashed."""
+        cache_path = os.path.join(self.temp_dir, "cache.db")
+        file_paths = [self.test_image_path] * 40
+        events = []
+        
+        def submit(fn, paths, *args):
+            events.append("submit")
+            future = Future()
+            future.set_result([("test_image.png", "text", "Success")] * len(paths))
+            return future
+        
+        mock_pool.return_value.submit.side_effect = submit
+        make_key = OCRCache.make_key
+        
+        def hash_file(*args):
+            events.append("hash")
+            return make_key(*args)
+        
+        processor = BatchProcessor(file_paths, "None", 127, cache_path=cache_path)
+        processor.file_processed = Mock()
+        processor.batch_processed = Mock()
+        processor.progress_updated = Mock()
+        processor.finished_processing = Mock()
+        
+        with patch.object(OCRCache, 'make_key', side_effect=hash_file):
+            processor.run()
+        
+        assert events.count("hash") == 40
+        assert events.index("submit") == 16  # After the first chunk only
+        assert processor.file_processed.emit.call_count == 40
+        processor.progress_updated.emit.assert_called_with(100)
+    
+    def test_apply_preprocessing_none(self, color_image):
         """Test no preprocessing."""
         processor = BatchProcessor([self.test_image_path], "None", 127)
         
-        test_img = np.ones((100, 100, 3), dtype=np.uint8) * 128
-        result = processor._apply_preprocessing(test_img)
+        result = processor._apply_preprocessing(color_image)
         
-        np.testing.assert_array_equal(result, test_img)
+        np.testing.assert_array_equal(result, color_image)
     
-    def test_apply_preprocessing_grayscale(self):
+    def test_apply_preprocessing_grayscale(self, color_image):
         """Test grayscale preprocessing."""
         processor = BatchProcessor([self.test_image_path], "Grayscale", 127)
         
-        test_img = np.ones((100, 100, 3), dtype=np.uint8) * 128
-        result = processor._apply_preprocessing(test_img)
+        result = processor._apply_preprocessing(color_image)
         
         assert len(result.shape) == 2  # Should be grayscale
         assert result.shape == (100, 100)
     
-    def test_apply_roi(self):
+    def test_apply_preprocessing_gray_input(self, gray_image):
+        """Test that grayscale-decoded inputs skip the colour conversion."""
+        processor = BatchProcessor([self.test_image_path], "Threshold", 127)
+        
+        result = processor._apply_preprocessing(gray_image)
+        
+        assert result.shape == (100, 100)
+        assert np.all(result == 255)
+    
+    def test_apply_roi(self, color_image):
         """Test ROI application."""
         processor = BatchProcessor([self.test_image_path], "None", 127, (10, 10, 50, 50))
         
-        test_img = np.ones((100, 100, 3), dtype=np.uint8) * 128
-        result = processor._apply_roi(test_img)
+        result = processor._apply_roi(color_image)
         
         assert result.shape == (40, 40, 3)  # ROI size
     
-    def test_apply_roi_invalid(self):
+    def test_apply_roi_invalid(self, color_image):
         """Test ROI application with invalid coordinates."""
         processor = BatchProcessor([self.test_image_path], "None", 127, (50, 50, 10, 10))
         
-        test_img = np.ones((100, 100, 3), dtype=np.uint8) * 128
-        result = processor._apply_roi(test_img)
+        result = processor._apply_roi(color_image)
         
         # Should return original image when ROI is invalid
-        np.testing.assert_array_equal(result, test_img)
\ No newline at end of file
+        np.testing.assert_array_equal(result, color_image)
+    
+    @patch('ocr_scanner.core.batch_processor._get_tess_api', return_value=None)
+    @patch('ocr_scanner.core.batch_processor.pytesseract.image_to_string')
+    def test_process_one(self, mock_ocr, mock_api):
+        """Test the worker-side single file pipeline."""
+        mock_ocr.return_value = "  Test text\n"
+        
+        result = _process_one(self.test_image_path, "Grayscale", 127, (10, 10, 50, 50), "eng")
+        
+        assert result == ("test_image.png", "Test text", "Success")
+    
+    @patch('ocr_scanner.core.batch_processor._get_tess_api', return_value=None)
+    @patch('ocr_scanner.core.batch_processor.pytesseract.image_to_string')
+    def test_process_chunk_single_tesseract_call(self, mock_ocr, mock_api):
+        """Test that a chunk is OCR'd in one call and split on form feeds."""
+        mock_ocr.return_value = "first\n\fsecond\n\f"
+        missing = os.path.join(self.temp_dir, "missing.png")
+        
+        results = _process_chunk([self.test_image_path, missing, self.test_image_path],
+                                 "None", 127, None, "eng")
+        
+        assert mock_ocr.call_count == 1
+        assert results == [
+            ("test_image.png", "first", "Success"),
+            ("missing.png", "", "Error: Could not load image"),
+            ("test_image.png", "second", "Success"),
+        ]
+    
+    @patch('ocr_scanner.core.batch_processor._get_tess_api', return_value=None)
+    @patch('ocr_scanner.core.batch_processor.pytesseract.image_to_string')
+    def test_process_chunk_falls_back_per_file(self, mock_ocr, mock_api):
+        """Test the per-file retry when the chunk output can't be split."""
+        mock_ocr.return_value = "unsplit"
+        
+        results = _process_chunk([self.test_image_path, self.test_image_path],
+                                 "None", 127, None, "eng")
+        
+        assert mock_ocr.call_count == 3
+        assert [status for _, _, status in results] == ["Success", "Success"]
+    
+    @patch('ocr_scanner.core.batch_processor.pytesseract.image_to_string')
+    @patch('ocr_scanner.core.batch_processor._get_tess_api')
+    def test_process_chunk_resident_engine(self, mock_api, mock_ocr):
+        """Test that a resident tesserocr engine replaces the CLI calls."""
+        api = mock_api.return_value
+        api.GetUTF8Text.side_effect = ["first\n", ""]
+        
+        results = _process_chunk([self.test_image_path, self.test_image_path],
+                                 "Grayscale", 127, None, "eng")
+        
+        mock_api.assert_called_once_with("eng")
+        assert api.SetImageBytes.call_count == 2
+        assert api.SetImageBytes.call_args[0][1:] == (100, 100, 1, 100)
+        mock_ocr.assert_not_called()
+        assert results == [
+            ("test_image.png", "first", "Success"),
+            ("test_image.png", "", "No text detected"),
+        ]
+    
+    @patch('ocr_scanner.core.batch_processor.pytesseract.image_to_string')
+    @patch('ocr_scanner.core.batch_processor._get_tess_api')
+    def test_process_chunk_roi(self, mock_api, mock_ocr):
+        """Test that only the ROI reaches the engine, whatever the method."""
+        api = mock_api.return_value
+        api.GetUTF8Text.return_value = "text"
+        roi = (10, 20, 60, 50)
+        
+        for method in ("Threshold", "Adaptive Threshold"):
+            _process_chunk([self.test_image_path], method, 127, roi, "eng")
+            assert api.SetImageBytes.call_args[0][1:] == (50, 30, 1, 50)
+    
+    @patch.dict('ocr_scanner.core.batch_processor._tess_apis', clear=True)
+    @patch('ocr_scanner.core.batch_processor.PyTessBaseAPI')
+    def test_get_tess_api_constructor_args(self, mock_api_cls):
+        """Test the worker engine gets the configured PSM as a plain value, once."""
+        mock_api_cls.side_effect = [MagicMock(), RuntimeError("no traineddata")]
+        
+        api = _get_tess_api("eng")
+        
+        assert _get_tess_api("eng") is api
+        mock_api_cls.assert_called_once_with(
+            lang="eng", psm=DEFAULT_OCR_CONFIG["page_segmentation_mode"])
+        # A failed start is remembered too
+        assert _get_tess_api("xyz") is None
+        assert _get_tess_api("xyz") is None
+        assert mock_api_cls.call_count == 2
+    
+    def test_process_one_missing_file(self):
+        """Test that an unreadable file is reported, not raised."""
+        missing = os.path.join(self.temp_dir, "missing.png")
+        
+        filename, text, status = _process_one(missing, "None", 127, None, "eng")
+        
+        assert filename == "missing.png"
+        assert text == ""
+        assert status == "Error: Could not load image"
@@ -4,107 +4,352 @@ Tests for image processor functionality.
 
 import pytest
 import numpy as np
-from unittest.mock import patch
+import cv2
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 
-from ocr_scanner.core.image_processor import ImageProcessor
+# _get_api is bound here so the module-wide CLI patch can't replace it
+from ocr_scanner.core.image_processor import ImageProcessor, _get_api
+
+
+# image_to_data output for two words; get_text_boxes only reads it at the
+# test images' size
+_MOCK_TEXT_BOXES = {
+    'text': ('Hello', 'World'),
+    'left': (10, 50),
+    'top': (10, 10),
+    'width': (30, 35),
+    'height': (20, 20),
+    'conf': (95, 90)
+}
+
+
+def _is_binary(img):
+    """Whether every pixel of a uint8 image is 0 or 255."""
+    # Adding 1 wraps 255 to 0 and maps 0 to 1; bits above the lowest are
+    # then clear for exactly those two values
+    return not ((img + np.uint8(1)) & 0xFE).any()
+
+
+def _luma(img):
+    """8-bit fixed-point BT.601 luma of a BGR image, as uint16."""
+    b, g, r = (img[..., c].astype(np.uint16) for c in range(3))
+    return (77 * r + 150 * g + 29 * b + 128) >> 8
+
+
+def _threshold_ref(img, threshold_value):
+    """NumPy reference for the "Threshold" method on a BGR image."""
+    return np.where(_luma(img) > threshold_value, 255, 0).astype(np.uint8)
+
+
+@pytest.fixture(scope="module")
+def color_image():
+    """Uniform BGR test image, shared read-only by the module's tests."""
+    image = np.full((100, 100, 3), 128, dtype=np.uint8)
+    image.setflags(write=False)
+    return image
+
+
+@pytest.fixture(scope="module")
+def strided_color_image():
+    """Uniform BGR test image as a strided (every other pixel) view."""
+    image = np.full((200, 200, 3), 128, dtype=np.uint8)
+    image.setflags(write=False)
+    return image[::2, ::2]
+
+
+@pytest.fixture(scope="module")
+def random_color_image():
+    """Seeded random BGR image at a realistic size, shared read-only.
+    
+    The odd width leaves a remainder after any vector-width loop.
+    """
+    image = np.random.default_rng(0).integers(0, 256, (1024, 1021, 3), dtype=np.uint8)
+    image.setflags(write=False)
+    return image
+
+
+@pytest.fixture(scope="module")
+def gray_image():
+    """Uniform grayscale test image, shared read-only by the module's tests."""
+    image = np.full((100, 100), 128, dtype=np.uint8)
+    image.setflags(write=False)
+    return image
+
+
+@pytest.fixture(scope="module")
+def _tesseract_cli_patches():
+    """Route OCR through mocked pytesseract calls, patched once for the module."""
+    with patch('ocr_scanner.core.image_processor._get_api', return_value=None), \
+            patch('ocr_scanner.core.image_processor.pytesseract.image_to_string') as image_to_string, \
+            patch('ocr_scanner.core.image_processor.pytesseract.image_to_data') as image_to_data:
+        yield SimpleNamespace(image_to_string=image_to_string, image_to_data=image_to_data)
+
+
+@pytest.fixture
+def tesseract_cli(_tesseract_cli_patches):
+    """The mocked pytesseract calls, with call records and return values reset."""
+    _tesseract_cli_patches.image_to_string.reset_mock(return_value=True)
+    _tesseract_cli_patches.image_to_data.reset_mock(return_value=True)
+    _tesseract_cli_patches.image_to_string.return_value = "Test text"
+    return _tesseract_cli_patches
 
 
 class TestImageProcessor:
     """Test cases for ImageProcessor class."""
     
-    def setup_method(self):
-        """Setup test fixtures."""
-        self.test_image = np.ones((100, 100, 3), dtype=np.uint8) * 128
-        self.test_gray_image = np.ones((100, 100), dtype=np.uint8) * 128
-    
-    def test_apply_preprocessing_none(self):
+    def test_apply_preprocessing_none(self, color_image):
         """Test no preprocessing."""
-        result = ImageProcessor.apply_preprocessing(self.test_image, "None")
-        np.testing.assert_array_equal(result, self.test_image)
+        result = ImageProcessor.apply_preprocessing(color_image, "None")
+        np.testing.assert_array_equal(result, color_image)
+    
+    @pytest.mark.parametrize("layout", ["color_image", "strided_color_image"])
+    @pytest.mark.parametrize("method, binary", [
+        ("Grayscale", False),
+        ("Threshold", True),
+        ("Adaptive Threshold", True),
+    ])
+    def test_apply_preprocessing_to_gray(self, request, layout, method, binary):
+        """Test the luminance-only preprocessing methods on packed and strided input."""
+        image = request.getfixturevalue(layout)
+        result = ImageProcessor.apply_preprocessing(image, method, 127)
+        
+        assert result.shape == (100, 100)  # Should be grayscale
+        if binary:
+            assert _is_binary(result)
+    
+    def test_apply_preprocessing_grayscale_weights(self, random_color_image):
+        """Test grayscale matches BT.601 luma, fixed-point and float, within 1."""
+        img = random_color_image
+        float_luma = np.rint(0.114 * img[..., 0] + 0.587 * img[..., 1] + 0.299 * img[..., 2])
+        
+        result = ImageProcessor.apply_preprocessing(img, "Grayscale")
+        
+        assert np.abs(result.astype(int) - _luma(img)).max() <= 1
+        assert np.abs(result - float_luma).max() <= 1
     
-    def test_apply_preprocessing_grayscale(self):
-        """Test grayscale preprocessing."""
-        result = ImageProcessor.apply_preprocessing(self.test_image, "Grayscale")
+    def test_apply_preprocessing_threshold_reference(self, random_color_image):
+        """Test thresholding agrees with the reference away from the cut-off."""
+        img = random_color_image
         
-        assert len(result.shape) == 2  # Should be grayscale
-        assert result.shape == (100, 100)
+        result = ImageProcessor.apply_preprocessing(img, "Threshold", 127)
+        
+        # Gray values may round differently by 1, which only matters for
+        # pixels right at the threshold
+        mismatch = result != _threshold_ref(img, 127)
+        luma = _luma(img)[mismatch]
+        assert ((luma == 127) | (luma == 128)).all()
     
-    def test_apply_preprocessing_threshold(self):
-        """Test threshold preprocessing."""
-        result = ImageProcessor.apply_preprocessing(self.test_image, "Threshold", 127)
+    @pytest.mark.parametrize("layout", ["color_image", "strided_color_image"])
+    def test_apply_preprocessing_bilateral_filter(self, request, layout):
+        """Test bilateral filter preprocessing keeps the image layout."""
+        image = request.getfixturevalue(layout)
+        result = ImageProcessor.apply_preprocessing(image, "Bilateral Filter")
         
-        assert len(result.shape) == 2  # Should be grayscale
-        assert result.shape == (100, 100)
-        # All values should be either 0 or 255
-        assert np.all((result == 0) | (result == 255))
+        assert result.shape == image.shape
+        assert result.dtype == np.uint8
+    
+    @patch('ocr_scanner.core.preprocessing_ops.cv2.ocl.useOpenCL', return_value=True)
+    def test_apply_preprocessing_opencl_matches_cpu(self, mock_ocl, color_image):
+        """Test that the UMat path gives the same result as the CPU path."""
+        for method in ("Adaptive Threshold", "Bilateral Filter"):
+            result = ImageProcessor.apply_preprocessing(color_image, method)
+            mock_ocl.return_value = False
+            expected = ImageProcessor.apply_preprocessing(color_image, method)
+            mock_ocl.return_value = True
+            
+            assert isinstance(result, np.ndarray)
+            np.testing.assert_array_equal(result, expected)
     
-    def test_apply_preprocessing_adaptive_threshold(self):
-        """Test adaptive threshold preprocessing."""
-        result = ImageProcessor.apply_preprocessing(self.test_image, "Adaptive Threshold")
+    @patch('ocr_scanner.core.preprocessing_ops.cv2.ocl.useOpenCL', return_value=True)
+    def test_apply_preprocessing_opencl_into_dst(self, mock_ocl, color_image):
+        """Test that the UMat path is taken with a buffer and fills it."""
+        expected = ImageProcessor.apply_preprocessing(color_image, "Adaptive Threshold")
+        dst = np.zeros(color_image.shape[:2], dtype=np.uint8)
+        
+        with patch('ocr_scanner.core.preprocessing_ops.cv2.UMat',
+                   wraps=cv2.UMat) as mock_umat:
+            result = ImageProcessor.apply_preprocessing(
+                color_image, "Adaptive Threshold", dst=dst)
         
-        assert len(result.shape) == 2  # Should be grayscale
-        assert result.shape == (100, 100)
-        # All values should be either 0 or 255
-        assert np.all((result == 0) | (result == 255))
+        mock_umat.assert_called_once()
+        assert result is dst
+        np.testing.assert_array_equal(dst, expected)
     
-    def test_apply_roi_valid(self):
+    def test_apply_roi_valid(self, color_image):
         """Test ROI application with valid coordinates."""
         roi_rect = (10, 10, 50, 50)
-        result = ImageProcessor.apply_roi(self.test_image, roi_rect)
+        result = ImageProcessor.apply_roi(color_image, roi_rect)
         
         assert result.shape == (40, 40, 3)  # ROI size
+        assert result.base is color_image  # A view, not a copy
     
-    def test_apply_roi_invalid(self):
+    def test_apply_roi_invalid(self, color_image):
         """Test ROI application with invalid coordinates."""
         roi_rect = (50, 50, 10, 10)  # Invalid: x2 < x1, y2 < y1
-        result = ImageProcessor.apply_roi(self.test_image, roi_rect)
+        result = ImageProcessor.apply_roi(color_image, roi_rect)
         
         # Should return original image when ROI is invalid
-        np.testing.assert_array_equal(result, self.test_image)
+        np.testing.assert_array_equal(result, color_image)
     
-    def test_apply_roi_out_of_bounds(self):
+    def test_apply_roi_out_of_bounds(self, color_image):
         """Test ROI application with out-of-bounds coordinates."""
         roi_rect = (-10, -10, 150, 150)  # Extends beyond image
-        result = ImageProcessor.apply_roi(self.test_image, roi_rect)
+        result = ImageProcessor.apply_roi(color_image, roi_rect)
         
         # Should clamp to image bounds
         assert result.shape == (100, 100, 3)  # Full image size
     
-    @patch('ocr_scanner.core.image_processor.pytesseract.image_to_string')
-    def test_run_ocr_color_image(self, mock_ocr):
-        """Test OCR on color image."""
-        mock_ocr.return_value = "Test text"
+    def test_apply_roi_random_rects(self):
+        """Test ROI clamping on random rectangles, in and out of bounds."""
+        img = np.arange(32 * 24, dtype=np.uint16).reshape(24, 32)
+        rects = np.random.default_rng(0).integers(-200, 201, size=(200, 4))
+        
+        for x1, y1, x2, y2 in rects.tolist():
+            result = ImageProcessor.apply_roi(img, (x1, y1, x2, y2))
+            
+            cx1, cy1 = max(0, x1), max(0, y1)
+            cx2, cy2 = min(32, x2), min(24, y2)
+            if cx2 > cx1 and cy2 > cy1:
+                np.testing.assert_array_equal(result, img[cy1:cy2, cx1:cx2])
+            else:
+                # Empty after clamping: the whole image is used
+                assert result is img
+    
+    @patch('ocr_scanner.core.image_processor.pytesseract.image_to_osd')
+    def test_auto_rotate_quarter_turn(self, mock_osd):
+        """Test that a 90 degree OSD result rotates clockwise without cropping."""
+        mock_osd.return_value = {'rotate': 90}
+        img = np.arange(6 * 4, dtype=np.uint8).reshape(6, 4)
+        
+        result = ImageProcessor._auto_rotate(img)
+        
+        np.testing.assert_array_equal(result, np.rot90(img, -1))
+        assert result.flags['C_CONTIGUOUS']
+    
+    def test_deskew_skewed_lines(self):
+        """Test deskewing rotates an image of slanted lines."""
+        skewed = np.full((300, 400), 255, dtype=np.uint8)
+        for y in range(40, 280, 30):
+            cv2.line(skewed, (20, y), (380, y + 20), 0, 2)
+        
+        result = ImageProcessor._deskew_image(skewed)
         
-        result = ImageProcessor.run_ocr(self.test_image)
+        assert result.shape == skewed.shape
+        assert not np.array_equal(result, skewed)
+    
+    def test_deskew_no_lines(self, gray_image):
+        """Test deskewing leaves an image without lines untouched."""
+        result = ImageProcessor._deskew_image(gray_image)
+        
+        np.testing.assert_array_equal(result, gray_image)
+    
+    def test_run_ocr_color_image(self, tesseract_cli, color_image):
+        """Test OCR on color image."""
+        result = ImageProcessor.run_ocr(color_image)
         
         assert result == "Test text"
-        mock_ocr.assert_called_once()
+        tesseract_cli.image_to_string.assert_called_once()
     
-    @patch('ocr_scanner.core.image_processor.pytesseract.image_to_string')
-    def test_run_ocr_grayscale_image(self, mock_ocr):
+    def test_run_ocr_grayscale_image(self, tesseract_cli, gray_image):
         """Test OCR on grayscale image."""
-        mock_ocr.return_value = "Test text"
-        
-        result = ImageProcessor.run_ocr(self.test_gray_image)
+        result = ImageProcessor.run_ocr(gray_image)
         
         assert result == "Test text"
-        mock_ocr.assert_called_once()
+        tesseract_cli.image_to_string.assert_called_once()
     
-    @patch('ocr_scanner.core.image_processor.pytesseract.image_to_data')
-    def test_get_text_boxes(self, mock_data):
+    def test_run_ocr_non_contiguous_image(self, tesseract_cli):
+        """Test OCR on a transposed view gets that view's pixels, packed."""
+        img = np.arange(40 * 30 * 3, dtype=np.uint8).reshape(40, 30, 3)
+        view = img.transpose(1, 0, 2)
+        assert not view.flags['C_CONTIGUOUS']
+        
+        ImageProcessor.run_ocr(view)
+        
+        seen = np.asarray(tesseract_cli.image_to_string.call_args[0][0])
+        assert seen.flags['C_CONTIGUOUS']
+        np.testing.assert_array_equal(
+            seen, cv2.cvtColor(np.ascontiguousarray(view), cv2.COLOR_BGR2GRAY))
+    
+    def test_get_text_boxes(self, tesseract_cli, color_image):
         """Test text box detection."""
-        mock_data.return_value = {
-            'text': ['Hello', 'World'],
-            'left': [10, 50],
-            'top': [10, 10],
-            'width': [30, 35],
-            'height': [20, 20],
-            'conf': [95, 90]
-        }
+        tesseract_cli.image_to_data.return_value = _MOCK_TEXT_BOXES
         
-        result = ImageProcessor.get_text_boxes(self.test_image)
+        result = ImageProcessor.get_text_boxes(color_image)
         
         assert 'text' in result
         assert 'left' in result
         assert len(result['text']) == 2
-        mock_data.assert_called_once()
\ No newline at end of file
+        tesseract_cli.image_to_data.assert_called_once()
+    
+    def test_run_ocr_batch_single_tesseract_call(self, tesseract_cli, color_image):
+        """Test that a batch is recognized by one Tesseract run over an image list."""
+        mock_ocr = tesseract_cli.image_to_string
+        mock_ocr.return_value = "".join(f"Text {i}\n\f" for i in range(100))
+        
+        result = ImageProcessor.run_ocr_batch([color_image] * 100)
+        
+        assert mock_ocr.call_count == 1
+        assert mock_ocr.call_args[0][0].endswith(".txt")
+        assert result == [f"Text {i}" for i in range(100)]
+    
+    @patch.dict('ocr_scanner.core.image_processor._API_CACHE', clear=True)
+    @patch('ocr_scanner.core.image_processor.PyTessBaseAPI')
+    def test_get_api_constructor_args(self, mock_api_cls):
+        """Test the resident engine is built with the plain PSM value, once."""
+        api = _get_api("eng", 6)
+        
+        assert api is mock_api_cls.return_value
+        mock_api_cls.assert_called_once_with(lang="eng", psm=6)
+        assert _get_api("eng", 6) is api
+        mock_api_cls.assert_called_once()
+    
+    @patch.dict('ocr_scanner.core.image_processor._API_CACHE', clear=True)
+    @patch('ocr_scanner.core.image_processor.PyTessBaseAPI')
+    def test_get_api_failure_cached(self, mock_api_cls):
+        """Test a failed engine start falls back to the CLI and isn't retried."""
+        mock_api_cls.side_effect = RuntimeError("no traineddata")
+        
+        assert _get_api("xyz", 6) is None
+        assert _get_api("xyz", 6) is None
+        mock_api_cls.assert_called_once()
+    
+    @patch('ocr_scanner.core.image_processor.pytesseract.image_to_string')
+    @patch('ocr_scanner.core.image_processor._get_api')
+    def test_run_ocr_resident_engine(self, mock_api, mock_ocr, color_image):
+        """Test OCR through a resident engine skips the tesseract CLI."""
+        api = MagicMock()
+        api.GetUTF8Text.return_value = "Test text\n"
+        mock_api.return_value = api
+        
+        result = ImageProcessor.run_ocr(color_image)
+        
+        assert result == "Test text"
+        api.SetImage.assert_called_once()
+        mock_ocr.assert_not_called()
+    
+    def test_get_text_boxes_large_image(self, tesseract_cli):
+        """Test that oversized images are downscaled and boxes mapped back."""
+        mock_data = tesseract_cli.image_to_data
+        mock_data.return_value = {
+            'text': ['Hello'], 'conf': [95],
+            'left': [100], 'top': [50], 'width': [40], 'height': [20],
+        }
+        large = np.zeros((4800, 2400, 3), dtype=np.uint8)
+        
+        result = ImageProcessor.get_text_boxes(large)
+        
+        assert mock_data.call_args[0][0].size == (1200, 2400)
+        assert result['left'] == [200]
+        assert result['top'] == [100]
+        assert result['width'] == [80]
+        assert result['height'] == [40]
+    
+    @patch('ocr_scanner.core.image_processor.ImageProcessor.run_ocr')
+    def test_warm_up_swallows_errors(self, mock_ocr):
+        """Test that a failing warm-up is logged, not raised."""
+        mock_ocr.side_effect = RuntimeError("tesseract not installed")
+        
+        ImageProcessor.warm_up("eng")
+        
+        mock_ocr.assert_called_once()
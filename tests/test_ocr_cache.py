@@ -0,0 +1,78 @@
+"""
+Tests for the OCR result cache.
+"""
+
+import os
+import tempfile
+from unittest.mock import patch
+
+from ocr_scanner.core.ocr_cache import OCRCache
+
+
+class TestOCRCache:
+    """Test cases for OCRCache class."""
+    
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = OCRCache(os.path.join(self.temp_dir, "cache.db"))
+        
+        self.file_a = os.path.join(self.temp_dir, "a.png")
+        self.file_b = os.path.join(self.temp_dir, "b.png")
+        for path in (self.file_a, self.file_b):
+            with open(path, "wb") as f:
+                f.write(b"same bytes")
+    
+    def teardown_method(self):
+        """Close the database."""
+        self.cache.close()
+    
+    def test_make_key_content_addressed(self):
+        """Test that identical files share a key and settings change it."""
+        key_a = OCRCache.make_key(self.file_a, "None", 127, None, "eng")
+        key_b = OCRCache.make_key(self.file_b, "None", 127, None, "eng")
+        
+        assert key_a == key_b
+        assert key_a != OCRCache.make_key(self.file_a, "Threshold", 127, None, "eng")
+        assert key_a != OCRCache.make_key(self.file_a, "None", 127, (0, 0, 10, 10), "eng")
+    
+    def test_make_key_ocr_settings(self):
+        """Test that the segmentation mode is part of the key and the size cap isn't."""
+        key = OCRCache.make_key(self.file_a, "None", 127, None, "eng")
+        
+        with patch.dict('ocr_scanner.core.ocr_cache.DEFAULT_OCR_CONFIG', page_segmentation_mode=3):
+            assert OCRCache.make_key(self.file_a, "None", 127, None, "eng") != key
+        with patch.dict('ocr_scanner.core.ocr_cache.DEFAULT_OCR_CONFIG', max_ocr_dim=1200):
+            # Batch OCR reads pages at full size, so the cap doesn't change the text
+            assert OCRCache.make_key(self.file_a, "None", 127, None, "eng") == key
+    
+    def test_make_key_missing_file(self):
+        """Test that unreadable files get no key."""
+        missing = os.path.join(self.temp_dir, "missing.png")
+        
+        assert OCRCache.make_key(missing, "None", 127, None, "eng") is None
+    
+    def test_put_get_clear(self):
+        """Test storing, looking up and clearing results."""
+        self.cache.put_many([("k1", "text"), ("k2", "")])
+        
+        assert self.cache.get_many(["k1", "k2", "k3"]) == {"k1": "text", "k2": ""}
+        
+        self.cache.clear()
+        
+        assert self.cache.get_many(["k1", "k2"]) == {}
+    
+    @patch('ocr_scanner.core.ocr_cache.time.time')
+    def test_prune(self, mock_time):
+        """Test pruning drops expired entries, then the oldest beyond the limit."""
+        for ts, key in enumerate(["k1", "k2", "k3", "k4"]):
+            mock_time.return_value = 1000 + ts
+            self.cache.put_many([(key, "text")])
+        mock_time.return_value = 1010
+        
+        removed = self.cache.prune(max_age=9, max_entries=2)
+        
+        assert removed == 2
+        assert set(self.cache.get_many(["k1", "k2", "k3", "k4"])) == {"k3", "k4"}
+        assert self.cache.prune(max_age=9, max_entries=1) == 1
+        assert set(self.cache.get_many(["k3", "k4"])) == {"k4"}
@@ -0,0 +1,31 @@
+"""
+Tests for text editor dialog helpers.
+"""
+
+import pytest
+
+from ocr_scanner.gui.text_editor_dialog import _capitalize_sentences
+
+
+def _capitalize_sentences_ref(text):
+    """The original list-based sentence capitalization."""
+    sentences = text.split('. ')
+    sentences = [s.strip().capitalize() for s in sentences if s.strip()]
+    return '. '.join(sentences)
+
+
+class TestTextEditorDialog:
+    """Test cases for the text editor dialog helpers."""
+    
+    @pytest.mark.parametrize("text", [
+        "",
+        "hello world",
+        "hello. world. NASA and Paris.  ",
+        "first.  second. . third",
+        " . leading. trailing. ",
+        "don't STOP. ça va. 3 apples. ß",
+        "line one\nline two. next\n",
+    ])
+    def test_capitalize_sentences_matches_reference(self, text):
+        """Test sentence capitalization gives exactly the original output."""
+        assert _capitalize_sentences(text) == _capitalize_sentences_ref(text)